@@ -0,0 +1,254 @@
+"""Benchmark offline untuk scraper: halaman hasil pencarian rekaman disajikan oleh server HTTP lokal.
+
+Contoh:
+    python benchmark.py                          # semua situs, 5 halaman per situs
+    python benchmark.py --sites detik,kompas --latency 0.05 --error-rate 0.1
+    python benchmark.py --record -k banjir       # rekam ulang fixture dari situs asli
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import main
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "fixtures")
+EMPTY_PAGE = "<html><body><p>Tidak ada hasil.</p></body></html>"
+
+
+def load_fixtures(fixture_dir, sites):
+    """Baca satu halaman hasil pencarian rekaman per situs (<site>.html)."""
+    fixtures = {}
+    for site_key in sites:
+        with open(os.path.join(fixture_dir, f"{site_key}.html"), encoding='utf-8') as f:
+            fixtures[site_key] = f.read().encode('utf-8')
+    return fixtures
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """Pengganti situs berita: /<site>/...?page=N menyajikan fixture untuk N <= pages, lalu halaman kosong.
+
+    latency/jitter menambah jeda per respons; error_rate adalah peluang respons 503.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, fixtures, pages=5, latency=0.0, jitter=0.0, error_rate=0.0, seed=0):
+        super().__init__(('127.0.0.1', 0), FixtureHandler)
+        self.fixtures = fixtures
+        self.pages = pages
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.errors = Counter()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def reset_counters(self):
+        with self._lock:
+            self.hits.clear()
+            self.errors.clear()
+
+    def respond(self, path):
+        """Kembalikan (status, body) untuk satu request dan catat hitungannya."""
+        parts = urlsplit(path)
+        site_key = parts.path.strip('/').split('/', 1)[0]
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            failed = self._random.random() < self.error_rate
+            self.hits[site_key] += 1
+            if failed:
+                self.errors[site_key] += 1
+        if delay:
+            time.sleep(delay)
+        if site_key not in self.fixtures:
+            return 404, b"not found"
+        if failed:
+            return 503, b"service unavailable"
+        page = int(parse_qs(parts.query).get('page', ['1'])[0])
+        return 200, self.fixtures[site_key] if page <= self.pages else EMPTY_PAGE.encode('utf-8')
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        status, body = self.server.respond(self.path)
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def point_sites_at(base_url, sites):
+    """Arahkan URL pencarian situs ke server lokal; kembalikan salinan SITES asli untuk dipulihkan."""
+    original = {site_key: dict(main.SITES[site_key]) for site_key in sites}
+    for site_key in sites:
+        site = main.SITES[site_key]
+        for field in ('search_url', 'date_search_url'):
+            if site.get(field):
+                site[field] = re.sub(r'^https?://[^/]+', f"{base_url}/{site_key}", site[field])
+    return original
+
+
+def measure_parse(site_key, html, parser, repeat):
+    """Rata-rata waktu parse_search_page untuk satu halaman, dalam milidetik."""
+    text = html.decode('utf-8')
+    started = time.perf_counter()
+    for _ in range(repeat):
+        main.parse_search_page(site_key, text, parser)
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def run_site(server, site_key, args, output_dir, trace_memory):
+    """Jalankan scrape_<site_key> sekali; kembalikan (artikel, halaman, retry, detik, peak byte)."""
+    scraper = main.OnlineMediaScraper(
+        fetch_backend=args.backend,
+        parser=args.parser,
+        # Politeness limits would dominate the numbers; the stand-in server does not need them
+        rate_limiter=main.HostRateLimiter(initial_rate=args.rate, max_rate=args.rate, burst=args.rate),
+        use_cache=False,
+        output_dir=output_dir,
+        parse_workers=args.parse_workers,
+    )
+    server.reset_counters()
+    try:
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        articles = getattr(scraper, f"scrape_{site_key}")(
+            args.keyword, args.start_date, args.end_date, args.max_articles)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        scraper.close()
+    errors = server.errors[site_key]
+    return articles, server.hits[site_key] - errors, errors, elapsed, peak
+
+
+def benchmark(args):
+    """Ukur setiap jalur scrape_* terhadap server fixture; kembalikan daftar hasil per situs."""
+    fixtures = load_fixtures(args.fixtures, args.sites)
+    server = FixtureServer(fixtures, args.pages, args.latency, args.jitter, args.error_rate, args.seed)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    original = point_sites_at(server.base_url, args.sites)
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            for site_key in args.sites:
+                runs = [run_site(server, site_key, args, output_dir, trace_memory=False) for _ in range(args.runs)]
+                peak = 0 if args.no_memory else run_site(server, site_key, args, output_dir, trace_memory=True)[4]
+                articles = sum(run[0] for run in runs)
+                pages = sum(run[1] for run in runs)
+                retries = sum(run[2] for run in runs)
+                elapsed = sum(run[3] for run in runs)
+                results.append({
+                    'site': site_key,
+                    'runs': args.runs,
+                    'pages': pages // args.runs,
+                    'articles': articles // args.runs,
+                    'retries': retries // args.runs,
+                    'seconds': elapsed / args.runs,
+                    'pages_per_sec': pages / elapsed if elapsed else 0.0,
+                    'articles_per_sec': articles / elapsed if elapsed else 0.0,
+                    'parse_ms_per_page': measure_parse(site_key, fixtures[site_key], args.parser or main.DEFAULT_PARSER,
+                                                       args.parse_repeat),
+                    'peak_memory_mb': peak / (1024 * 1024),
+                })
+    finally:
+        main.SITES.update(original)
+        server.shutdown()
+        server.server_close()
+    return results
+
+
+def print_report(results):
+    header = f"{'situs':<10}{'halaman':>9}{'artikel':>9}{'retry':>7}{'hal/s':>10}{'artikel/s':>11}{'parse ms':>10}{'peak MB':>9}"
+    print(header)
+    print('-' * len(header))
+    for row in results:
+        print(f"{row['site']:<10}{row['pages']:>9}{row['articles']:>9}{row['retries']:>7}"
+              f"{row['pages_per_sec']:>10.1f}{row['articles_per_sec']:>11.1f}"
+              f"{row['parse_ms_per_page']:>10.2f}{row['peak_memory_mb']:>9.2f}")
+
+
+def record_fixtures(args):
+    """Ambil halaman 1 hasil pencarian dari situs asli dan simpan sebagai fixture baru."""
+    scraper = main.OnlineMediaScraper(use_cache=False, output_dir=tempfile.mkdtemp())
+    try:
+        os.makedirs(args.fixtures, exist_ok=True)
+        for site_key in args.sites:
+            site = main.SITES[site_key]
+            url = site['search_url'].format(keyword=args.keyword, page=1, start=args.start_date, end=args.end_date)
+            response = scraper.fetch(url, timeout=site['timeout'])
+            response.raise_for_status()
+            path = os.path.join(args.fixtures, f"{site_key}.html")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(response.text)
+            print(f"{site_key}: {len(response.text)} byte disimpan ke {path}")
+    finally:
+        scraper.close()
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Benchmark offline scraper berita dengan fixture rekaman.")
+    parser.add_argument('--sites', type=main._sites_arg, default=list(main.SITES),
+                        help=f"daftar situs dipisah koma (default: {','.join(main.SITES)})")
+    parser.add_argument('--fixtures', default=FIXTURE_DIR, help="direktori fixture <site>.html")
+    parser.add_argument('-k', '--keyword', default='banjir', help="keyword pencarian (default: banjir)")
+    parser.add_argument('-s', '--start-date', type=main._date_arg, default=date(2025, 1, 1))
+    parser.add_argument('-e', '--end-date', type=main._date_arg, default=date(2025, 12, 31))
+    parser.add_argument('--pages', type=int, default=5, help="jumlah halaman berisi hasil per situs")
+    parser.add_argument('-n', '--max-articles', type=int, default=10 ** 6, help="maksimum artikel per situs")
+    parser.add_argument('--runs', type=int, default=3, help="jumlah pengulangan per situs")
+    parser.add_argument('--latency', type=float, default=0.0, help="jeda per respons dalam detik")
+    parser.add_argument('--jitter', type=float, default=0.0, help="tambahan jeda acak maksimum dalam detik")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="peluang respons 503 (0-1)")
+    parser.add_argument('--seed', type=int, default=0, help="seed untuk jitter dan error")
+    parser.add_argument('--rate', type=float, default=1000.0, help="batas request per detik ke server lokal")
+    parser.add_argument('--backend', choices=['requests', 'async'], default='requests', help="backend fetch HTTP")
+    parser.add_argument('--parser', help=f"parser HTML BeautifulSoup (default: {main.DEFAULT_PARSER})")
+    parser.add_argument('--parse-workers', type=int, default=0, help="jumlah proses parser HTML")
+    parser.add_argument('--parse-repeat', type=int, default=20, help="pengulangan untuk mengukur parse ms/halaman")
+    parser.add_argument('--no-memory', action='store_true', help="lewati pengukuran peak memory (tracemalloc)")
+    parser.add_argument('--json', help="simpan hasil juga sebagai JSON ke path ini")
+    parser.add_argument('--record', action='store_true', help="rekam ulang fixture dari situs asli lalu keluar")
+    return parser
+
+
+def main_cli(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    main.configure_logging('WARNING')
+    if args.record:
+        record_fixtures(args)
+        return main.EXIT_OK
+    results = benchmark(args)
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return main.EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
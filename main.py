@@ -1,728 +1,2665 @@
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-from datetime import datetime
+from bs4 import BeautifulSoup, SoupStrainer
+from datetime import datetime, timedelta, timezone
+import re
+import random
+from functools import lru_cache
+from email.utils import parsedate_to_datetime
 import os
+import sys
+import argparse
+import socket
+import logging
+import json
+import csv
+import sqlite3
+import zlib
+import hashlib
+import bisect
+from array import array
+from collections import Counter
 import urllib.parse
+import importlib.util
 import time
-import random
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+import threading
+import asyncio
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 from urllib3.util.retry import Retry
 
-class OnlineMediaScraper:
-    def __init__(self):
-        self.data = []
-        self.output_dir = "scraped_media_data"
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5'
-        }
-        self.data = []
-
-    def scrape_detik(self, keyword, start_date, end_date, max_articles=50):
-        print(f"Scraping Detik.com untuk keyword: {keyword}")
-        encoded_keyword = urllib.parse.quote(keyword)
-        page = 1
-        articles_found = 0
-        keyword_lower = keyword.lower()
+# lxml is several times faster than the pure-Python html.parser; use it when installed
+DEFAULT_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
 
-        while articles_found < max_articles:
-            search_url = f"https://www.detik.com/search/searchall?query={encoded_keyword}&page={page}&result_type=relevansi"
-            try:
-                response = requests.get(search_url, headers=self.headers, timeout=10)
-                print(f"Status kode untuk halaman {page}: {response.status_code}")
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-                articles = soup.find_all('article')
-                print(f"Halaman {page}: Ditemukan {len(articles)} artikel.")
-
-                if not articles:
-                    print("Tidak ada artikel lagi di Detik.com atau halaman habis.")
-                    break
+# Shared retry policy for every fetch backend
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 1
+RETRY_STATUS_FORCELIST = [429, 500, 502, 503, 504]
 
-                for article in articles:
-                    try:
-                        title_tag = article.find('h3', class_='media__title') or article.find('h3', class_='dtr-ttl')
-                        date_tag = article.find('span', class_='media__date')
-                        link_tag = article.find('a', href=True)
+# Library code only logs; handlers and levels are set up by configure_logging()
+logger = logging.getLogger("scraper")
+logger.addHandler(logging.NullHandler())
 
-                        print(f"Title tag: {title_tag}, Date tag: {date_tag}, Link tag: {link_tag}")
-                        if not (title_tag and link_tag):
-                            print(f"Artikel tidak memiliki elemen lengkap (judul atau tautan). Missing: title={not title_tag}, link={not link_tag}")
-                            continue
+# Record attributes copied into JSON log lines when present
+LOG_CONTEXT_FIELDS = ('site', 'keyword')
 
-                        title = title_tag.text.strip()
-                        if keyword_lower not in title.lower():
-                            print(f"Judul tidak mengandung keyword '{keyword}': {title}")
-                            continue
 
-                        link = link_tag['href']
-
-                        article_date = None
-                        if date_tag:
-                            article_date_str = date_tag.find('span')['title'].strip() if date_tag.find('span') else ''
-                            print(f"Raw date string: {article_date_str}")
-                            try:
-                                article_date = datetime.strptime(article_date_str, '%d %b %Y %H:%M WIB')
-                            except ValueError as e:
-                                print(f"Error parsing date: {e}, Raw date: {article_date_str}")
-                                article_date = None
-
-                        if article_date is None or (start_date <= article_date.date() <= end_date):
-                            self.data.append({
-                                'platform': 'Detik.com',
-                                'date': start_date,
-                                'title': title,
-                                'url': link,
-                                'keyword': keyword
-                            })
-                            articles_found += 1
-                            print(f"Artikel ditemukan: {title}")
+def site_logger(site_key, keyword=None):
+    """Logger per situs (scraper.<site_key>) yang membawa konteks site/keyword di setiap record."""
+    context = {'site': site_key}
+    if keyword is not None:
+        context['keyword'] = keyword
+    return logging.LoggerAdapter(logging.getLogger(f"scraper.{site_key}"), context)
 
-                        if articles_found >= max_articles:
-                            break
 
-                    except Exception as e:
-                        print(f"Error parsing artikel Detik.com: {e}")
-                        continue
+class JsonLogFormatter(logging.Formatter):
+    """Format record log sebagai satu objek JSON per baris."""
 
-                page += 1
-                time.sleep(random.uniform(1, 3))
-
-            except Exception as e:
-                print(f"Error saat scraping Detik.com: {e}")
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in LOG_CONTEXT_FIELDS:
+            if hasattr(record, field):
+                entry[field] = getattr(record, field)
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(level=logging.INFO, fmt='text'):
+    """Pasang handler stderr untuk logger 'scraper' dengan level dan format (text/json) tertentu."""
+    handler = logging.StreamHandler()
+    if fmt == 'json':
+        handler.setFormatter(JsonLogFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    for existing in logger.handlers[:]:
+        if not isinstance(existing, logging.NullHandler):
+            logger.removeHandler(existing)
+    logger.addHandler(handler)
+    logger.setLevel(level)
+
+class FetchResult:
+    """Respons HTTP ringkas dengan atribut yang sama seperti requests.Response."""
+
+    def __init__(self, url, status_code, text, headers=None, from_cache=False, fetched_at=None):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.from_cache = from_cache
+        self.fetched_at = fetched_at or datetime.now(WIB)
+        # Filled in by AsyncFetcher for the metrics: retries used, seconds slept, last attempt latency
+        self.retries = 0
+        self.slept = 0.0
+        self.latency = 0.0
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class HostRateLimiter:
+    """Token bucket per host yang lajunya menyesuaikan latensi, respons 429/503 dan Retry-After.
+
+    Laju naik sedikit demi sedikit selama host merespons cepat, turun setengah
+    ketika host membatasi kita, dan host diblokir sampai batas Retry-After.
+    Aman dipakai dari banyak thread maupun dari event loop AsyncFetcher.
+    """
+
+    THROTTLE_STATUSES = (429, 503)
+
+    def __init__(self, initial_rate=0.5, min_rate=0.1, max_rate=5.0, burst=1,
+                 target_latency=2.0, increase_step=0.1, decrease_factor=0.5):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.target_latency = target_latency
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host):
+        if host not in self._hosts:
+            self._hosts[host] = {
+                'rate': self.initial_rate,
+                'tokens': float(self.burst),
+                'updated': time.monotonic(),
+                'blocked_until': 0.0,
+            }
+        return self._hosts[host]
+
+    def reserve(self, url):
+        """Ambil satu token untuk host URL dan kembalikan lama menunggu (detik) sebelum request."""
+        host = urllib.parse.urlsplit(url).netloc
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            state['tokens'] = min(self.burst, state['tokens'] + (now - state['updated']) * state['rate'])
+            state['updated'] = now
+            # Tokens may go negative: each waiter reserves its own slot in the queue
+            state['tokens'] -= 1
+            wait = max(0.0, -state['tokens'] / state['rate'])
+            return max(wait, state['blocked_until'] - now)
+
+    def acquire(self, url):
+        """Versi blocking dari reserve(); kembalikan lama tidur yang dilakukan."""
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def record(self, url, status_code, latency, retry_after=None):
+        """Sesuaikan laju host dari hasil satu request (status_code None berarti gagal/timeout)."""
+        host = urllib.parse.urlsplit(url).netloc
+        with self._lock:
+            state = self._state(host)
+            if status_code in self.THROTTLE_STATUSES or status_code is None:
+                state['rate'] = max(self.min_rate, state['rate'] * self.decrease_factor)
+            elif latency > self.target_latency:
+                state['rate'] = max(self.min_rate, state['rate'] * 0.8)
+            else:
+                state['rate'] = min(self.max_rate, state['rate'] + self.increase_step)
+            delay = _parse_retry_after(retry_after)
+            if delay:
+                state['blocked_until'] = max(state['blocked_until'], time.monotonic() + delay)
+
+    def rate(self, url):
+        """Laju saat ini (request/detik) untuk host URL."""
+        host = urllib.parse.urlsplit(url).netloc
+        with self._lock:
+            return self._state(host)['rate']
+
+
+def _parse_retry_after(value):
+    """Ubah header Retry-After (detik atau HTTP-date) menjadi jumlah detik, atau None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class AsyncFetcher:
+    """Backend fetch asyncio (aiohttp) dengan koneksi keep-alive per host dan batas request global."""
+
+    def __init__(self, headers, max_in_flight=100, per_host_connections=8, keepalive_timeout=30, rate_limiter=None):
+        import aiohttp  # optional dependency, only needed for the async backend
+
+        self._aiohttp = aiohttp
+        self.headers = headers
+        self.rate_limiter = rate_limiter
+        self.max_in_flight = max_in_flight
+        self.per_host_connections = per_host_connections
+        self.keepalive_timeout = keepalive_timeout
+        # The event loop lives in its own thread so the synchronous scrapers can share it
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-fetcher", daemon=True)
+        self._thread.start()
+        self._run(self._open())
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _open(self):
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        connector = self._aiohttp.TCPConnector(
+            limit=self.max_in_flight,
+            limit_per_host=self.per_host_connections,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=300,
+        )
+        self._session = self._aiohttp.ClientSession(connector=connector, headers=self.headers)
+
+    async def fetch_async(self, url, timeout=10, headers=None):
+        """Ambil satu URL di event loop fetcher, dengan retry yang sama seperti Session."""
+        client_timeout = self._aiohttp.ClientTimeout(total=timeout)
+        slept = 0.0
+        for attempt in range(RETRY_TOTAL + 1):
+            wait = RETRY_BACKOFF_FACTOR * (2 ** (attempt - 1)) if attempt else 0.0
+            if self.rate_limiter is not None:
+                wait += self.rate_limiter.reserve(url)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                slept += wait
+            start = time.monotonic()
+            try:
+                async with self._semaphore:
+                    async with self._session.get(url, timeout=client_timeout, headers=headers) as response:
+                        text = await response.text(errors='replace')
+                        result = FetchResult(str(response.url), response.status, text, dict(response.headers))
+            except (self._aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                # Connection and read errors are retried like urllib3's Retry(total=...) does
+                if self.rate_limiter is not None:
+                    self.rate_limiter.record(url, None, time.monotonic() - start)
+                if attempt == RETRY_TOTAL:
+                    raise
+                continue
+            except Exception:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.record(url, None, time.monotonic() - start)
+                raise
+            if self.rate_limiter is not None:
+                self.rate_limiter.record(url, result.status_code, time.monotonic() - start, result.headers.get('Retry-After'))
+            if result.status_code not in RETRY_STATUS_FORCELIST:
                 break
-
-        print(f"Selesai scraping Detik.com: {articles_found} artikel ditemukan.")
-
-    def scrape_kompas(self, keyword, start_date, end_date, max_articles=50):
-        """Scrape Kompas.com berdasarkan keyword dan periode waktu."""
-        print(f"Scraping Kompas.com untuk keyword: {keyword}")
-        encoded_keyword = urllib.parse.quote(keyword)
-        page = 1
-        articles_found = 0
-        keyword_lower = keyword.lower()
-
-        while articles_found < max_articles:
-            search_url = f"https://search.kompas.com/search?q={encoded_keyword}&page={page}"
+        result.retries = attempt
+        result.slept = slept
+        result.latency = time.monotonic() - start
+        return result
+
+    def fetch(self, url, timeout=10, headers=None):
+        """Versi blocking dari fetch_async, aman dipanggil dari banyak thread."""
+        return self._run(self.fetch_async(url, timeout, headers))
+
+    def fetch_many(self, urls, timeout=10, headers=None):
+        """Ambil banyak URL sekaligus; hasil berupa FetchResult atau exception per URL."""
+        headers = headers or [None] * len(urls)
+
+        async def gather():
+            return await asyncio.gather(
+                *(self.fetch_async(url, timeout, url_headers) for url, url_headers in zip(urls, headers)),
+                return_exceptions=True,
+            )
+        return self._run(gather())
+
+    def close(self):
+        self._run(self._session.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+class BrowserFetcher:
+    """Pool browser Chrome headless (Selenium) yang tetap hangat untuk halaman yang dirender JavaScript.
+
+    Browser dibuat saat pertama dibutuhkan sampai pool_size, lalu dipakai ulang
+    oleh semua thread; browser yang error ditutup dan diganti.
+    """
+
+    def __init__(self, pool_size=2, render_wait=2.0, user_agent=None):
+        # Optional dependencies, only needed for the browser fallback
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        self._webdriver = webdriver
+        self._service = Service
+        self._driver_manager = ChromeDriverManager
+        self._driver_path = None
+        self.pool_size = pool_size
+        self.render_wait = render_wait
+        self.user_agent = user_agent
+        self._cond = threading.Condition()
+        self._drivers = []
+        self._idle = []
+        self._starting = 0
+
+    def _create(self):
+        if self._driver_path is None:
+            self._driver_path = self._driver_manager().install()
+        options = self._webdriver.ChromeOptions()
+        for argument in ('--headless=new', '--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu',
+                         '--blink-settings=imagesEnabled=false'):
+            options.add_argument(argument)
+        if self.user_agent:
+            options.add_argument(f"--user-agent={self.user_agent}")
+        return self._webdriver.Chrome(service=self._service(self._driver_path), options=options)
+
+    def _acquire(self):
+        with self._cond:
+            while not self._idle and len(self._drivers) + self._starting >= self.pool_size:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._starting += 1
+        # Starting Chrome takes seconds, so it happens outside the lock
+        try:
+            driver = self._create()
+        except Exception:
+            with self._cond:
+                self._starting -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._starting -= 1
+            self._drivers.append(driver)
+        return driver
+
+    def _release(self, driver, broken=False):
+        with self._cond:
+            if broken:
+                self._drivers.remove(driver)
+            else:
+                self._idle.append(driver)
+            self._cond.notify()
+        if broken:
             try:
-                session = requests.Session()
-                retries = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
-                session.mount('https://', HTTPAdapter(max_retries=retries))
-                response = session.get(search_url, headers=self.headers, timeout=15)
-                print(f"Status kode untuk halaman {page}: {response.status_code}")
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-                articles = soup.find_all('div', class_='article__item')  
-                print(f"Halaman {page}: Ditemukan {len(articles)} artikel.")
-                print(f"Articles: {articles[:2]}")
-                # print(f"Raw HTML (first 1000 chars): {response.text[:1000]}")
-
-                response = requests.get(search_url, headers=self.headers, timeout=10)
-                print(f"Status kode untuk halaman {page}: {response.status_code}")
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-                articles = soup.find_all('div', class_='article__item')
-                print(f"Halaman {page}: Ditemukan {len(articles)} artikel.")
-                print(f"Articles: {articles}")
-
-                if not articles:
-                    print("Tidak ada artikel lagi di Kompas.com atau halaman habis.")
-                    break
-
-                for article in articles:
-                    try:
-                        title_tag = article.find('h3', class_='article__title')
-                        date_tag = article.find('div', class_='article__date')
-                        link_tag = article.find('a', class_='article__link', href=True)
+                driver.quit()
+            except Exception:
+                pass
+
+    def fetch(self, url, timeout=30):
+        """Render URL di salah satu browser pool dan kembalikan HTML akhirnya sebagai FetchResult."""
+        driver = self._acquire()
+        try:
+            driver.set_page_load_timeout(timeout)
+            driver.get(url)
+            # Search results are usually filled in by XHR after the load event
+            if self.render_wait:
+                time.sleep(self.render_wait)
+            html = driver.page_source
+        except Exception:
+            self._release(driver, broken=True)
+            raise
+        self._release(driver)
+        return FetchResult(url, 200, html)
+
+    def close(self):
+        with self._cond:
+            drivers, self._drivers, self._idle = self._drivers, [], []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+def normalize_url(url):
+    """Bentuk kanonik URL: scheme/host huruf kecil, tanpa port default dan fragment, query terurut."""
+    parts = urllib.parse.urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme, netloc.rsplit(':', 1)[-1]) in (('http', '80'), ('https', '443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True)))
+    return urllib.parse.urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+
+
+class ResponseCache:
+    """Cache respons HTTP di disk (SQLite) dengan TTL, revalidasi ETag/Last-Modified dan eviksi LRU.
+
+    Kunci cache adalah URL yang dinormalisasi. Body disimpan terkompresi zlib.
+    Jika total ukuran melewati max_bytes, entri yang paling lama tidak diakses dibuang.
+    """
+
+    def __init__(self, path, ttl=3600, max_bytes=512 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # The timeout lets several scraper processes share one cache file
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, url TEXT, status INTEGER, headers TEXT, body BLOB,"
+            " etag TEXT, last_modified TEXT, fetched_at REAL, accessed_at REAL, size INTEGER)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+        self._total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, url):
+        """Kembalikan entri cache (dict) untuk URL, atau None."""
+        key = normalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, headers, body, etag, last_modified, fetched_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        url, status, headers, body, etag, last_modified, fetched_at = row
+        return {
+            'url': url,
+            'status': status,
+            'headers': json.loads(headers),
+            'text': zlib.decompress(body).decode('utf-8'),
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': fetched_at,
+        }
 
-                        print(f"Title tag: {title_tag}")
-                        print(f"Date tag: {date_tag}")
-                        print(f"Link tag: {link_tag}")
+    def is_fresh(self, entry):
+        return time.time() - entry['fetched_at'] < self.ttl
+
+    @staticmethod
+    def to_result(entry):
+        return FetchResult(entry['url'], entry['status'], entry['text'], entry['headers'], from_cache=True,
+                           fetched_at=datetime.fromtimestamp(entry['fetched_at'], WIB))
+
+    @staticmethod
+    def revalidation_headers(entry):
+        """Header kondisional untuk memvalidasi ulang entri yang sudah kedaluwarsa."""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url, response):
+        """Simpan respons sukses; entri lama dengan kunci yang sama ditimpa."""
+        key = normalize_url(url)
+        body = zlib.compress(response.text.encode('utf-8'))
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() in ('content-type', 'etag', 'last-modified', 'date')}
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, response.status_code, json.dumps(headers), body,
+                 response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now, len(body)),
+            )
+            self._total_size += len(body) - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, url):
+        """Tandai entri masih valid (setelah 304 Not Modified)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+                               (now, now, normalize_url(url)))
+            self._conn.commit()
+
+    def _evict(self):
+        while self._total_size > self.max_bytes:
+            row = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at LIMIT 1").fetchone()
+            if row is None:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            self._total_size -= row[1]
+
+    def iter_pages(self, host=None):
+        """Iterasi (url, html) semua halaman tersimpan, misalnya untuk benchmark parser."""
+        with self._lock:
+            rows = self._conn.execute("SELECT url, body FROM responses").fetchall()
+        for url, body in rows:
+            if host is None or urllib.parse.urlsplit(url).netloc.endswith(host):
+                yield url, zlib.decompress(body).decode('utf-8')
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _container_candidates(tags, class_names):
+    """Kombinasi (tag, class) kandidat kontainer artikel, sesuai urutan prioritas."""
+    return [(tag, class_name) for class_name in class_names for tag in tags]
+
+
+# Declarative description of every supported site. Selectors are (tag, class)
+# pairs tried in order; a class of None matches the tag regardless of class.
+# 'body' holds the selectors used by the optional article-body stage.
+# Sites whose search can filter by date provide date_search_url (formatted with
+# start/end dates) and date_search_sorted when those results come newest first.
+SITES = {
+    'detik': {
+        'platform': 'Detik.com',
+        'search_url': "https://www.detik.com/search/searchall?query={keyword}&page={page}&result_type=relevansi",
+        # Detik filters on publish date server-side and can sort newest first
+        'date_search_url': (
+            "https://www.detik.com/search/searchall?query={keyword}&page={page}&result_type=latest"
+            "&sortby=time&fromdatex={start:%d/%m/%Y}&todatex={end:%d/%m/%Y}"
+        ),
+        'date_search_sorted': True,
+        'timeout': 10,
+        'containers': [('article', None)],
+        'title': [('h3', 'media__title'), ('h3', 'dtr-ttl')],
+        'date': [('span', 'media__date')],
+        # The full timestamp lives in the title attribute of a nested <span>
+        'date_attr': ('span', 'title'),
+        'link': [('a', None)],
+        'body': {
+            'content': [('div', 'detail__body-text'), ('div', 'itp_bodycontent')],
+            'author': [('div', 'detail__author')],
+            'tags': [('div', 'detail__body-tag'), ('div', 'nav')],
+        },
+    },
+    'kompas': {
+        'platform': 'Kompas.com',
+        'search_url': "https://search.kompas.com/search?q={keyword}&page={page}",
+        'timeout': 15,
+        'containers': [('div', 'article__item')],
+        'title': [('h3', 'article__title')],
+        'date': [('div', 'article__date')],
+        # "Rabu, 14/05/2025 09:00" -> "14/05/2025 09:00"
+        'date_split': (', ', 1),
+        'link': [('a', 'article__link')],
+        'body': {
+            'content': [('div', 'read__content')],
+            'author': [('div', 'credit-title-name'), ('div', 'read__credit')],
+            'tags': [('ul', 'tag__article__wrap'), ('div', 'tag__article')],
+        },
+    },
+    'cnn': {
+        'platform': 'CNNIndonesia.com',
+        'search_url': "https://www.cnnindonesia.com/search/?query={keyword}&page={page}",
+        'timeout': 10,
+        'containers': _container_candidates(
+            ['article', 'div'],
+            ['nhl-box', 'article-list', 'list-news', 'article-item', 'list', 'article', 'news-item', 'media__item'],
+        ),
+        'title': [('h2', 'title'), ('h3', 'title')],
+        'date': [('span', 'date'), ('div', 'date')],
+        'link': [('a', None)],
+        'body': {
+            'content': [('div', 'detail-text'), ('div', 'detail_text')],
+            'author': [('div', 'author')],
+            'tags': [('div', 'detail-tags'), ('div', 'list-topik')],
+        },
+    },
+    'tempo': {
+        'platform': 'Tempo.co',
+        'search_url': "https://www.tempo.co/search?q={keyword}&page={page}",
+        'timeout': 10,
+        'containers': _container_candidates(['div', 'article'], ['card', 'article', 'list-item', 'news-item']),
+        'title': [('h2', 'title'), ('h3', 'title'), ('h2', 'judul')],
+        'date': [('span', 'date'), ('div', 'date'), ('span', 'tanggal')],
+        'link': [('a', None)],
+        'body': {
+            'content': [('div', 'detail-konten'), ('div', 'detail-in')],
+            'author': [('span', 'author'), ('div', 'author')],
+            'tags': [('div', 'tags'), ('ul', 'tags')],
+        },
+    },
+    'liputan6': {
+        'platform': 'Liputan6.com',
+        'search_url': "https://www.liputan6.com/search?q={keyword}&page={page}",
+        'timeout': 10,
+        'containers': _container_candidates(['article', 'div'], ['articles--item', 'article', 'list-item', 'news-item']),
+        'title': [('h4', 'articles--title'), ('h3', 'articles--title'), ('h2', 'title')],
+        'date': [('span', 'articles--date'), ('div', 'articles--date'), ('time', None)],
+        'link': [('a', None)],
+        'body': {
+            'content': [('div', 'article-content-body__item-content')],
+            'author': [('span', 'read-page--header--author__name'), ('a', 'read-page--header--author__link')],
+            'tags': [('ul', 'tags--snippet__list'), ('div', 'tags--snippet')],
+        },
+    },
+    'viva': {
+        'platform': 'Viva.co.id',
+        'search_url': "https://www.viva.co.id/search?q={keyword}&page={page}",
+        'timeout': 10,
+        'containers': _container_candidates(['div', 'article'], ['article-list', 'article', 'list-item', 'news-item']),
+        'title': [('h3', 'title'), ('h4', 'title'), ('h2', 'article-title')],
+        'date': [('span', 'date'), ('div', 'date'), ('time', None)],
+        'link': [('a', None)],
+        'body': {
+            'content': [('div', 'main-content-detail'), ('div', 'article-detail-body')],
+            'author': [('div', 'article-detail-author'), ('span', 'author')],
+            'tags': [('div', 'article-detail-tags'), ('div', 'tag-list')],
+        },
+    },
+    'antara': {
+        'platform': 'AntaraNews.com',
+        'search_url': "https://www.antaranews.com/search?q={keyword}&page={page}",
+        'timeout': 10,
+        'containers': _container_candidates(
+            ['div', 'article'],
+            ['search-result-item', 'news-article', 'post-item', 'article-item', 'news-post', 'post', 'article', 'list-item', 'news-item'],
+        ),
+        'title': [
+            ('h3', ['post-title', 'title', 'article-title']),
+            ('h2', ['post-title', 'title', 'article-title']),
+            ('h4', ['post-title', 'title', 'article-title']),
+        ],
+        'date': [('span', ['post-date', 'date', 'article-date']), ('div', ['post-date', 'date', 'article-date']), ('time', None)],
+        'link': [('a', None)],
+        # Antara returns relative article links
+        'link_base': "https://www.antaranews.com",
+        # The keyword may only appear in the summary
+        'summary': [('p', 'summary'), ('div', 'excerpt')],
+        'body': {
+            'content': [('div', 'wrap__article-detail-content'), ('div', 'post-content')],
+            'author': [('p', 'text-muted'), ('span', 'author')],
+            'tags': [('div', 'wrap__article-detail-tag'), ('div', 'tags')],
+        },
+    },
+}
+
+
+def _find_first(element, selectors, **attrs):
+    """Kembalikan tag pertama yang cocok dengan salah satu selector (tag, class)."""
+    for tag, class_name in selectors:
+        if class_name is None:
+            found = element.find(tag, **attrs)
+        else:
+            found = element.find(tag, class_=class_name, **attrs)
+        if found:
+            return found
+    return None
+
+
+def _container_strainer(site):
+    """SoupStrainer yang hanya membangun subtree kandidat kontainer artikel."""
+    tags = sorted({tag for tag, _ in site['containers']})
+    class_names = {class_name for _, class_name in site['containers']}
+    if None in class_names:
+        return SoupStrainer(tags)
+    return SoupStrainer(tags, class_=sorted(class_names))
+
+
+def make_soup(site, html, parser=DEFAULT_PARSER, partial=True):
+    """Parse halaman pencarian; dengan partial=True hanya kontainer artikel yang dibangun."""
+    if partial:
+        return BeautifulSoup(html, parser, parse_only=_container_strainer(site))
+    return BeautifulSoup(html, parser)
+
+
+def _matches_selector(element, tag, class_name):
+    """True jika element cocok dengan selector (tag, class), sama seperti find_all(tag, class_=...)."""
+    return element.name == tag and (class_name is None or class_name in (element.get('class') or []))
+
+
+def find_article_containers(site, soup, preferred=None):
+    """Cari kontainer artikel; kembalikan (artikel, selector yang cocok).
+
+    Selector hasil pembelajaran (preferred) dicoba lebih dulu. Jika gagal, semua
+    kandidat dicocokkan dalam satu kali penelusuran pohon dokumen dan kandidat
+    dengan prioritas tertinggi yang menemukan artikel dipakai.
+    """
+    candidates = site['containers']
+    if preferred in candidates:
+        tag, class_name = preferred
+        articles = soup.find_all(tag) if class_name is None else soup.find_all(tag, class_=class_name)
+        if articles:
+            return articles, preferred
+
+    # Single pass over every element whose tag name can match; div/article are
+    # included so the "unique classes" diagnostic needs no extra scan
+    tag_names = {tag for tag, _ in candidates} | {'div', 'article'}
+    elements = soup.find_all(list(tag_names))
+    buckets = [[] for _ in candidates]
+    for element in elements:
+        for index, (tag, class_name) in enumerate(candidates):
+            if _matches_selector(element, tag, class_name):
+                buckets[index].append(element)
+
+    for selector, articles in zip(candidates, buckets):
+        if articles:
+            if selector[1] is not None:
+                logger.debug("Ditemukan artikel dengan class: %s", selector[1])
+            return articles, selector
+
+    logger.info("Tidak ditemukan artikel di halaman %s.", site['platform'])
+    # Collecting the class diagnostic walks every element, so only pay for it when asked
+    if logger.isEnabledFor(logging.DEBUG):
+        unique_classes = set(
+            element['class'][0] for element in elements
+            if element.name in ('div', 'article') and element.get('class')
+        )
+        logger.debug("Class unik yang ditemukan: %s", unique_classes)
+    return [], None
+
+
+class SelectorCache:
+    """Simpan selector kontainer yang terakhir berhasil per situs ke disk (JSON)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._selectors = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self._selectors = {site_key: tuple(selector) for site_key, selector in json.load(f).items()}
+            except (OSError, ValueError) as e:
+                logger.warning("Cache selector tidak bisa dibaca, dimulai dari kosong: %s", e)
+
+    def get(self, site_key):
+        with self._lock:
+            return self._selectors.get(site_key)
+
+    def set(self, site_key, selector):
+        """Catat selector pemenang; file hanya ditulis ulang jika ada perubahan."""
+        selector = tuple(selector)
+        with self._lock:
+            if self._selectors.get(site_key) == selector:
+                return
+            self._selectors[site_key] = selector
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({key: list(value) for key, value in self._selectors.items()}, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def extract_article_fields(site, article):
+    """Ambil judul, tautan, teks tanggal dan ringkasan dari satu kontainer artikel."""
+    title_tag = _find_first(article, site['title'])
+    date_tag = _find_first(article, site['date'])
+    link_tag = _find_first(article, site['link'], href=True)
+    summary_tag = _find_first(article, site.get('summary', []))
+
+    date_str = ''
+    if date_tag:
+        if site.get('date_attr'):
+            child_tag, attr = site['date_attr']
+            child = date_tag.find(child_tag)
+            date_str = child.get(attr, '').strip() if child else ''
+        else:
+            date_str = date_tag.text.strip()
+        if date_str and site.get('date_split'):
+            separator, index = site['date_split']
+            parts = date_str.split(separator)
+            date_str = parts[index] if len(parts) > index else ''
+
+    link = link_tag['href'] if link_tag else ''
+    if link and site.get('link_base') and not link.startswith('http'):
+        link = f"{site['link_base']}{link}"
+
+    return {
+        'title': ' '.join(title_tag.text.split()) if title_tag else '',
+        'link': link,
+        'date_str': date_str,
+        'summary': summary_tag.text.strip() if summary_tag else '',
+    }
+
+
+def parse_search_page(site_key, html, parser=DEFAULT_PARSER, partial=True, preferred=None):
+    """Parse HTML halaman pencarian menjadi (daftar field artikel, selector pemenang).
+
+    Fungsi murni tingkat modul agar bisa dijalankan di proses parser terpisah:
+    yang dikirim balik hanya dict kecil, bukan objek BeautifulSoup.
+    """
+    site = SITES[site_key]
+    soup = make_soup(site, html, parser, partial)
+    articles, selector = find_article_containers(site, soup, preferred)
+    items = []
+    for article in articles:
+        try:
+            items.append(extract_article_fields(site, article))
+        except Exception as e:
+            logger.warning("Error parsing artikel %s: %s", site['platform'], e)
+    return items, selector
+
+
+def extract_article_body(site, html, parser=DEFAULT_PARSER):
+    """Ambil isi, penulis dan tag dari halaman artikel; meta tag dipakai sebagai cadangan."""
+    soup = BeautifulSoup(html, parser)
+    body = site.get('body', {})
+
+    content_tag = _find_first(soup, body.get('content', [])) or soup.find('article')
+    content = ''
+    if content_tag:
+        paragraphs = [p.get_text(' ', strip=True) for p in content_tag.find_all('p')]
+        content = '\n'.join(p for p in paragraphs if p) or content_tag.get_text(' ', strip=True)
+
+    author_tag = _find_first(soup, body.get('author', []))
+    author = author_tag.get_text(' ', strip=True) if author_tag else ''
+    if not author:
+        meta = soup.find('meta', attrs={'name': 'author'})
+        author = meta.get('content', '').strip() if meta else ''
+
+    tags_tag = _find_first(soup, body.get('tags', []))
+    tags = [a.get_text(strip=True) for a in tags_tag.find_all('a')] if tags_tag else []
+    if not tags:
+        meta = soup.find('meta', attrs={'name': 'keywords'})
+        tags = [tag.strip() for tag in meta.get('content', '').split(',')] if meta else []
+
+    return {'author': author, 'tags': [tag for tag in tags if tag], 'content': content}
+
+
+# Indonesian time zones; dates without a zone are assumed to be WIB
+WIB = timezone(timedelta(hours=7), 'WIB')
+TIMEZONES = {'wib': WIB, 'wita': timezone(timedelta(hours=8), 'WITA'), 'wit': timezone(timedelta(hours=9), 'WIT')}
+
+# Indonesian and English month names and abbreviations, keyed by their first three letters
+MONTHS = {
+    'jan': 1, 'feb': 2, 'peb': 2, 'mar': 3, 'apr': 4, 'mei': 5, 'may': 5, 'jun': 6, 'jul': 7,
+    'agu': 8, 'agt': 8, 'ags': 8, 'aug': 8, 'sep': 9, 'okt': 10, 'oct': 10, 'nov': 11, 'nop': 11,
+    'des': 12, 'dec': 12,
+}
+
+RELATIVE_UNITS = {
+    'detik': timedelta(seconds=1),
+    'menit': timedelta(minutes=1),
+    'jam': timedelta(hours=1),
+    'hari': timedelta(days=1),
+    'minggu': timedelta(weeks=1),
+    'bulan': timedelta(days=30),
+    'tahun': timedelta(days=365),
+}
+
+_TIME = r'(?:[,\s|\-]+(?:pukul\s+)?(\d{1,2})[:.](\d{2})(?:[:.]\d{2})?)?(?:\s*(WIB|WITA|WIT)\b)?'
+
+
+class IndonesianDateParser:
+    """Parser tanggal artikel untuk semua situs.
+
+    Memahami nama bulan Indonesia/Inggris ("14 Mei 2025, 09:00 WIB", "3 Agu 2024"),
+    format angka ("14/05/2025 09:00", "2025-05-14 09:00"), waktu relatif
+    ("2 jam yang lalu", "kemarin") dan zona WIB/WITA/WIT. Hasilnya datetime
+    yang timezone-aware. Pola yang terakhir berhasil diingat per situs dan
+    dicoba lebih dulu; hasil tanggal absolut di-cache per teks.
+    """
+
+    PATTERNS = [
+        ('month_name', re.compile(r'(\d{1,2})\s+([A-Za-z]{3,9})\.?\s+(\d{4})' + _TIME, re.IGNORECASE)),
+        ('numeric', re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})' + _TIME, re.IGNORECASE)),
+        ('iso', re.compile(r'(\d{4})-(\d{2})-(\d{2})(?:[T\s](\d{2}):(\d{2})(?::\d{2})?)?(?:\s*(WIB|WITA|WIT)\b)?', re.IGNORECASE)),
+        ('relative', re.compile(r'(\d+)\s+(detik|menit|jam|hari|minggu|bulan|tahun)\s+(?:yang\s+)?lalu', re.IGNORECASE)),
+        ('yesterday', re.compile(r'\bkemarin\b', re.IGNORECASE)),
+    ]
 
-                        if not (title_tag and link_tag):
-                            print(f"Artikel tidak memiliki elemen lengkap (judul atau tautan). Missing: title={not title_tag}, link={not link_tag}")
-                            continue
+    def __init__(self):
+        self._preferred = {}
+        self._lock = threading.Lock()
+
+    def parse(self, text, site_key=None):
+        """Parse teks tanggal; None jika tidak dikenali."""
+        return self.parse_detailed(text, site_key)[0]
+
+    def parse_detailed(self, text, site_key=None, now=None):
+        """Kembalikan (datetime atau None, keyakinan: 'exact', 'day', 'relative' atau 'missing').
+
+        Waktu relatif dihitung dari now (misalnya waktu halaman diambil).
+        """
+        text = ' '.join(text.split()) if text else ''
+        if not text:
+            return None, 'missing'
+        with self._lock:
+            preferred = self._preferred.get(site_key)
+        order = list(range(len(self.PATTERNS)))
+        if preferred is not None:
+            order.remove(preferred)
+            order.insert(0, preferred)
+
+        for index in order:
+            kind, pattern = self.PATTERNS[index]
+            if kind in ('relative', 'yesterday'):
+                result, confidence = self._parse_relative(kind, pattern, text, now), 'relative'
+            else:
+                result, has_time = _parse_absolute(index, text)
+                confidence = 'exact' if has_time else 'day'
+            if result is not None:
+                if site_key is not None and index != preferred:
+                    with self._lock:
+                        self._preferred[site_key] = index
+                return result, confidence
+        return None, 'missing'
+
+    @staticmethod
+    def _parse_relative(kind, pattern, text, now):
+        match = pattern.search(text)
+        if not match:
+            return None
+        now = now or datetime.now(WIB)
+        if kind == 'yesterday':
+            return now - timedelta(days=1)
+        return now - int(match.group(1)) * RELATIVE_UNITS[match.group(2).lower()]
+
+
+@lru_cache(maxsize=65536)
+def _parse_absolute(index, text):
+    """Parse tanggal absolut dengan pola ke-index; kembalikan (datetime atau None, ada jam?). Di-cache."""
+    kind, pattern = IndonesianDateParser.PATTERNS[index]
+    match = pattern.search(text)
+    if not match:
+        return None, False
+    if kind == 'month_name':
+        day, month_name, year, hour, minute, zone = match.groups()
+        month = MONTHS.get(month_name[:3].lower())
+        if month is None:
+            return None, False
+    elif kind == 'numeric':
+        day, month, year, hour, minute, zone = match.groups()
+    else:
+        year, month, day, hour, minute, zone = match.groups()
+    try:
+        parsed = datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0),
+                          tzinfo=TIMEZONES.get((zone or 'wib').lower(), WIB))
+    except ValueError:
+        return None, False
+    return parsed, hour is not None
+
+
+# Shared by every scraper thread; safe for concurrent use
+DATE_PARSER = IndonesianDateParser()
+
+
+def parse_article_date(date_str, site_key=None):
+    """Parse teks tanggal artikel menjadi datetime timezone-aware (WIB bila zona tidak disebut)."""
+    return DATE_PARSER.parse(date_str, site_key)
+
+
+def parse_article_date_detailed(date_str, site_key=None, now=None):
+    """Seperti parse_article_date, tetapi juga mengembalikan tingkat keyakinan tanggal."""
+    return DATE_PARSER.parse_detailed(date_str, site_key, now)
+
+
+class SeenUrlIndex:
+    """Indeks persisten URL artikel yang sudah pernah dikumpulkan, lintas run dan keyword.
+
+    Setiap URL (dinormalisasi) disimpan sebagai hash 8 byte. Entri dari disk
+    dimuat ke array terurut (8 byte per URL, dicari dengan bisect); URL baru
+    ditahan di memori dan baru ditulis ke file saat flush(), yaitu setelah
+    artikelnya benar-benar tersimpan di output.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._known = array('Q')
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Ignore a torn trailing entry from an interrupted write
+            self._known.frombytes(data[:len(data) - len(data) % 8])
+            self._known = array('Q', sorted(self._known))
+        self._new = set()
+        self._pending = []
+
+    @staticmethod
+    def _digest(url):
+        return int.from_bytes(hashlib.blake2b(normalize_url(url).encode('utf-8'), digest_size=8).digest(), 'little')
+
+    def _contains(self, digest):
+        index = bisect.bisect_left(self._known, digest)
+        return (index < len(self._known) and self._known[index] == digest) or digest in self._new
+
+    def __len__(self):
+        return len(self._known) + len(self._new)
+
+    def contains(self, url):
+        digest = self._digest(url)
+        with self._lock:
+            return self._contains(digest)
+
+    def add(self, url):
+        """Tandai URL sudah dikumpulkan; False jika URL sudah ada sebelumnya."""
+        digest = self._digest(url)
+        with self._lock:
+            if self._contains(digest):
+                return False
+            self._new.add(digest)
+            self._pending.append(digest)
+            return True
+
+    def mark(self):
+        """Posisi daftar URL tertunda saat ini, untuk rollback()."""
+        with self._lock:
+            return len(self._pending)
+
+    def rollback(self, mark):
+        """Lupakan URL yang ditambahkan sejak mark() dan belum di-flush (mis. dari job yang gagal)."""
+        with self._lock:
+            for digest in self._pending[mark:]:
+                self._new.discard(digest)
+            del self._pending[mark:]
+
+    def flush(self):
+        """Tulis URL baru ke file indeks."""
+        with self._lock:
+            if not self._pending:
+                return
+            with open(self.path, 'ab') as f:
+                f.write(array('Q', self._pending).tobytes())
+            self._pending = []
+
+
+class CheckpointStore:
+    """Checkpoint per (situs, keyword): tanggal dan URL artikel terbaru yang sudah dikumpulkan.
+
+    Disimpan sebagai JSON. Saat save(), isi file digabung dengan perubahan run
+    ini sehingga beberapa proses bisa berbagi file yang sama. scrape_site hanya
+    memperbarui checkpoint jika paginasi sampai ke checkpoint lama, melewati
+    awal periode, atau sampai hasil habis.
+    """
+
+    MAX_RECENT_URLS = 200
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._checkpoints = self._read()
+        self._dirty = set()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Checkpoint tidak bisa dibaca, dimulai dari kosong: %s", e)
+            return {}
+
+    @staticmethod
+    def _key(site_key, keyword):
+        return f"{site_key}|{' '.join(keyword.lower().split())}"
+
+    def get(self, site_key, keyword):
+        """Kembalikan (tanggal terbaru atau None, set URL terbaru) untuk situs dan keyword."""
+        with self._lock:
+            checkpoint = self._checkpoints.get(self._key(site_key, keyword))
+        if not checkpoint:
+            return None, set()
+        newest = self._parse_date(checkpoint['newest_date']) if checkpoint.get('newest_date') else None
+        return newest, set(checkpoint.get('recent_urls', []))
+
+    def update(self, site_key, keyword, urls, newest_date):
+        """Catat artikel yang dikumpulkan run ini (urls urut dari yang pertama ditemukan)."""
+        if not urls and newest_date is None:
+            return
+        key = self._key(site_key, keyword)
+        with self._lock:
+            checkpoint = self._checkpoints.setdefault(key, {})
+            self._merge(checkpoint, {
+                'newest_date': newest_date.isoformat() if newest_date else None,
+                'recent_urls': list(urls),
+            })
+            self._dirty.add(key)
+
+    @staticmethod
+    def _parse_date(value):
+        parsed = datetime.fromisoformat(value)
+        return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=WIB)
+
+    def _merge(self, checkpoint, update):
+        # Compare as datetimes: ISO strings with different offsets (+07:00, +08:00) do not sort by time
+        dates = [value for value in (checkpoint.get('newest_date'), update.get('newest_date')) if value]
+        checkpoint['newest_date'] = max(dates, key=self._parse_date) if dates else None
+        recent = list(dict.fromkeys(update.get('recent_urls', []) + checkpoint.get('recent_urls', [])))
+        checkpoint['recent_urls'] = recent[:self.MAX_RECENT_URLS]
+        checkpoint['updated_at'] = datetime.now().isoformat(timespec='seconds')
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            on_disk = self._read()
+            for key in self._dirty:
+                self._merge(on_disk.setdefault(key, {}), self._checkpoints[key])
+            self._checkpoints = on_disk
+            self._dirty = set()
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(on_disk, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+
+
+class TitleClusterer:
+    """Kelompokkan judul yang hampir sama (berita yang sama di beberapa media) dengan MinHash dan LSH.
+
+    Judul diubah menjadi shingle karakter lalu signature MinHash. Judul yang
+    berbagi bucket LSH dan estimasi kemiripan Jaccard-nya minimal threshold
+    digabung ke satu cluster; tidak ada perbandingan semua pasangan, sehingga
+    waktunya kira-kira linear terhadap jumlah record.
+    """
+
+    # Mersenne prime for the (a * h + b) mod p permutations; 32-bit shingle hashes keep the products small
+    PRIME = (1 << 31) - 1
+
+    def __init__(self, threshold=0.5, num_perm=64, bands=16, shingle_size=4, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm harus kelipatan bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self._permutations = [(rng.randrange(1, self.PRIME), rng.randrange(0, self.PRIME)) for _ in range(num_perm)]
+
+    def shingles(self, title):
+        """Shingle karakter dari judul yang dinormalisasi (huruf kecil, tanpa tanda baca)."""
+        text = ' '.join(re.findall(r'\w+', title.lower()))
+        size = self.shingle_size
+        if len(text) <= size:
+            return {text}
+        return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+    def signature(self, title):
+        hashes = [int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'little') % self.PRIME
+                  for shingle in self.shingles(title)]
+        prime = self.PRIME
+        return [min((a * h + b) % prime for h in hashes) for a, b in self._permutations]
+
+    def similarity(self, signature_a, signature_b):
+        """Estimasi kemiripan Jaccard dari dua signature."""
+        return sum(1 for x, y in zip(signature_a, signature_b) if x == y) / self.num_perm
+
+    def cluster(self, titles):
+        """Kembalikan cluster id untuk setiap judul (mulai 1, urut kemunculan pertama)."""
+        parent = list(range(len(titles)))
+
+        def find(index):
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        signatures = [self.signature(title) for title in titles]
+        # Each LSH bucket keeps only its first member; comparing against it keeps the work linear
+        buckets = {}
+        for index, signature in enumerate(signatures):
+            for band in range(self.bands):
+                key = (band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+                first = buckets.setdefault(key, index)
+                if first == index or find(first) == find(index):
+                    continue
+                if self.similarity(signature, signatures[first]) >= self.threshold:
+                    parent[find(index)] = find(first)
+
+        cluster_ids = {}
+        return [cluster_ids.setdefault(find(index), len(cluster_ids) + 1) for index in range(len(titles))]
+
+
+# Column order of every output record
+# 'date' is the article's publish date (WIB calendar day); 'date_confidence' is
+# 'exact' (date and time), 'day' (date only), 'relative' ("2 jam yang lalu",
+# resolved against fetched_at) or 'missing'
+RECORD_FIELDS = ['platform', 'date', 'published_at', 'fetched_at', 'date_confidence', 'title', 'url', 'keyword']
+# Extra columns filled in by the article-body stage
+BODY_FIELDS = ['author', 'tags', 'content']
+# Extra column filled in by the near-duplicate clustering stage
+CLUSTER_FIELDS = ['cluster_id']
+
+
+class RecordSink:
+    """Tulis setiap artikel ke disk (CSV atau JSONL) segera setelah diterima.
+
+    Data di-flush (dan di-fsync) per batch atau setelah flush_interval detik.
+    Jika file sudah ada, sink melanjutkannya: baris terakhir yang terpotong
+    karena crash dibuang dan artikel (keyword, url) yang sudah tertulis dilewati.
+    File CSV dengan header yang berbeda dari fields ditolak (ValueError).
+    """
+
+    def __init__(self, path, fmt=None, flush_every=20, flush_interval=5.0, fields=None):
+        self.path = path
+        self.fields = fields or RECORD_FIELDS
+        self.fmt = fmt or ('jsonl' if path.endswith(('.jsonl', '.json')) else 'csv')
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._seen = set()
+
+        resumed = os.path.exists(path) and os.path.getsize(path) > 0
+        if resumed:
+            self._repair_tail()
+            self._check_header()
+            self._load_existing()
+            logger.info("Melanjutkan output %s: %d artikel sudah tersimpan.", path, len(self._seen))
+        self._file = open(path, 'a', encoding='utf-8', newline='')
+        if self.fmt == 'csv':
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fields, extrasaction='ignore')
+            if not resumed or os.path.getsize(path) == 0:
+                self._writer.writeheader()
+
+    def _repair_tail(self):
+        """Buang record terakhir yang tidak lengkap akibat crash."""
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            if self.fmt != 'csv':
+                # json.dumps escapes newlines, so every complete JSONL record ends with one
+                if not data.endswith(b'\n'):
+                    f.truncate(data.rfind(b'\n') + 1)
+                return
+            # A quoted CSV field may contain newlines; a record only ends at a newline
+            # outside quotes, i.e. where the running count of quote characters is even
+            end = quotes = offset = 0
+            for line in data.splitlines(keepends=True):
+                offset += len(line)
+                quotes += line.count(b'"')
+                if line.endswith(b'\n') and quotes % 2 == 0:
+                    end = offset
+            if end != len(data):
+                f.truncate(end)
+
+    def _check_header(self):
+        if self.fmt != 'csv' or os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, encoding='utf-8', newline='') as f:
+            header = next(csv.reader(f), [])
+        if header != list(self.fields):
+            raise ValueError(f"Header {self.path} ({', '.join(header)}) tidak cocok dengan kolom output "
+                             f"({', '.join(self.fields)}); gunakan file output lain.")
+
+    def _load_existing(self):
+        with open(self.path, encoding='utf-8', newline='') as f:
+            if self.fmt == 'csv':
+                rows = csv.DictReader(f)
+            else:
+                rows = (json.loads(line) for line in f if line.strip())
+            for row in rows:
+                self._seen.add((row.get('keyword'), row.get('url')))
+
+    def write(self, record):
+        """Tulis satu record; kembalikan False jika sudah pernah ditulis."""
+        key = (record.get('keyword'), record.get('url'))
+        with self._lock:
+            if key in self._seen:
+                return False
+            self._seen.add(key)
+            if self.fmt == 'csv':
+                self._writer.writerow({field: _csv_value(record.get(field)) for field in self.fields})
+            else:
+                self._file.write(json.dumps(record, ensure_ascii=False, default=_json_default) + '\n')
+            self.count += 1
+            self._pending += 1
+            if self._pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+            return True
+
+    def _flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._flush()
+                self._file.close()
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return ', '.join(value)
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def _json_default(value):
+    # Same ISO 8601 form as the CSV output, e.g. 2025-05-14T09:00:00+07:00
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+class JobQueue:
+    """Antrian job (keyword, situs, rentang halaman) di SQLite yang bisa dipakai banyak worker/proses.
+
+    Worker mengambil job dengan lease berbatas waktu; job yang lease-nya habis
+    (worker mati) diambil ulang oleh worker lain. Job yang gagal dicoba lagi
+    sampai max_attempts, dan record hasil setiap job disimpan di tabel results.
+    File SQLite bisa diletakkan di storage bersama agar worker di beberapa node
+    berbagi antrian yang sama.
+    """
+
+    def __init__(self, path, lease_seconds=600, max_attempts=3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY, keyword TEXT, site TEXT, first_page INTEGER, last_page INTEGER,"
+            " start_date TEXT, end_date TEXT, max_articles INTEGER, status TEXT DEFAULT 'pending',"
+            " attempts INTEGER DEFAULT 0, lease_owner TEXT, lease_expires REAL, last_error TEXT,"
+            " result_count INTEGER, updated_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_expires)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS results (job_id INTEGER, record TEXT)")
+
+    def enqueue(self, keyword, site_key, start_date, end_date, max_articles=50, first_page=1, last_page=None):
+        """Tambahkan satu job; kembalikan id-nya."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (keyword, site, first_page, last_page, start_date, end_date, max_articles, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (keyword, site_key, first_page, last_page, start_date.isoformat(), end_date.isoformat(),
+                 max_articles, time.time()),
+            )
+            return cursor.lastrowid
+
+    def enqueue_batch(self, keywords, sites, start_date, end_date, max_articles=50, pages_per_job=None, max_pages=None):
+        """Pecah keyword x situs (x rentang halaman) menjadi job; kembalikan jumlah job yang dibuat.
+
+        Tanpa pages_per_job setiap pasangan keyword/situs menjadi satu job dengan
+        paginasi penuh. Dengan pages_per_job, halaman 1..max_pages dibagi menjadi
+        rentang sebesar itu.
+        """
+        count = 0
+        for keyword in keywords:
+            for site_key in sites:
+                if pages_per_job is None:
+                    ranges = [(1, max_pages)]
+                else:
+                    ranges = [(first, min(first + pages_per_job - 1, max_pages))
+                              for first in range(1, max_pages + 1, pages_per_job)]
+                for first_page, last_page in ranges:
+                    self.enqueue(keyword, site_key, start_date, end_date, max_articles, first_page, last_page)
+                    count += 1
+        return count
+
+    def lease(self, worker_id):
+        """Ambil job berikutnya (baru, atau lease-nya sudah habis) untuk worker ini; None jika kosong."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs whose worker died too often are given up on
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'failed', lease_owner = NULL, updated_at = ?"
+                    " WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                    (now, now, self.max_attempts),
+                )
+                row = self._conn.execute(
+                    "SELECT id, keyword, site, first_page, last_page, start_date, end_date, max_articles, attempts"
+                    " FROM jobs WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?)"
+                    " ORDER BY id LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?,"
+                        " attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                        (worker_id, now + self.lease_seconds, now, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        job_id, keyword, site_key, first_page, last_page, start_date, end_date, max_articles, attempts = row
+        return {
+            'id': job_id,
+            'keyword': keyword,
+            'site': site_key,
+            'first_page': first_page,
+            'last_page': last_page,
+            'start_date': datetime.fromisoformat(start_date).date(),
+            'end_date': datetime.fromisoformat(end_date).date(),
+            'max_articles': max_articles,
+            'attempt': attempts + 1,
+        }
 
-                        title = title_tag.text.strip()
-                        if keyword_lower not in title.lower():
-                            print(f"Judul tidak mengandung keyword '{keyword}': {title}")
-                            continue
+    def heartbeat(self, job_id, worker_id):
+        """Perpanjang lease; False jika job sudah tidak dipegang worker ini."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time() + self.lease_seconds, job_id, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id, records):
+        """Simpan record hasil dan tandai job selesai; diabaikan jika lease sudah pindah ke worker lain."""
+        rows = [(job_id, json.dumps(record, ensure_ascii=False, default=_json_default)) for record in records]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._conn.execute(
+                    "UPDATE jobs SET status = 'done', lease_owner = NULL, result_count = ?, last_error = NULL,"
+                    " updated_at = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                    (len(rows), time.time(), job_id, worker_id),
+                )
+                if cursor.rowcount == 1:
+                    self._conn.executemany("INSERT INTO results (job_id, record) VALUES (?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return cursor.rowcount == 1
+
+    def fail(self, job_id, worker_id, error):
+        """Kembalikan job ke antrian untuk dicoba lagi, atau tandai gagal setelah max_attempts."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,"
+                " lease_owner = NULL, last_error = ?, updated_at = ?"
+                " WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (self.max_attempts, str(error), time.time(), job_id, worker_id),
+            )
+
+    def counts(self):
+        """Jumlah job per status."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def results(self):
+        """Semua record hasil job yang selesai, tanpa duplikat (keyword, url).
+
+        Job rentang halaman masing-masing memakai max_articles penuh; di sini
+        jumlahnya dibatasi lagi menjadi max_articles per keyword per situs,
+        mengutamakan halaman awal.
+        """
+        with self._lock:
+            # Page-range jobs of one keyword/site are enqueued in page order, so job id order is page order
+            rows = self._conn.execute(
+                "SELECT r.record, j.keyword, j.site, j.max_articles FROM results r JOIN jobs j ON j.id = r.job_id"
+                " ORDER BY r.job_id, r.rowid"
+            ).fetchall()
+        seen = set()
+        per_site = Counter()
+        records = []
+        for row, keyword, site_key, max_articles in rows:
+            record = json.loads(row)
+            key = (record.get('keyword'), record.get('url'))
+            if key in seen or per_site[keyword, site_key] >= max_articles:
+                continue
+            seen.add(key)
+            per_site[keyword, site_key] += 1
+            if record.get('date'):
+                record['date'] = datetime.fromisoformat(record['date']).date()
+            for field in ('published_at', 'fetched_at'):
+                if record.get(field):
+                    record[field] = datetime.fromisoformat(record[field])
+            records.append(record)
+        return records
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ScrapeMetrics:
+    """Metrik kinerja per situs (counter dan histogram), aman dipakai dari banyak thread.
+
+    Diekspor sebagai file teks format Prometheus (untuk textfile collector)
+    atau sebagai ringkasan JSON per run.
+    """
+
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    # name -> (Prometheus type, help text)
+    METRICS = {
+        'scraper_fetch_seconds': ('histogram', "Latensi fetch jaringan per request"),
+        'scraper_parse_seconds': ('histogram', "Waktu parse per halaman pencarian"),
+        'scraper_fetch_bytes_total': ('counter', "Byte body yang diunduh dari jaringan"),
+        'scraper_fetch_retries_total': ('counter', "Retry HTTP yang dipakai"),
+        'scraper_fetch_errors_total': ('counter', "Fetch yang gagal dengan exception"),
+        'scraper_cache_hits_total': ('counter', "Halaman yang dilayani cache respons"),
+        'scraper_rate_limit_sleep_seconds_total': ('counter', "Waktu tidur karena rate limiter dan backoff"),
+        'scraper_pages_total': ('counter', "Halaman pencarian yang di-parse"),
+        'scraper_browser_fetches_total': ('counter', "Halaman yang dirender lewat browser headless"),
+        'scraper_articles_total': ('counter', "Artikel per hasil: accepted atau alasan disaring"),
+    }
 
-                        date_str = date_tag.text.strip().split(', ')[1] if date_tag else ''
-                        try:
-                            article_date = datetime.strptime(date_str, '%d/%m/%Y %H:%M') if date_str else None
-                        except ValueError as e:
-                            print(f"Error parsing date: {e}, Raw date: {date_str}")
-                            article_date = None
-                        link = link_tag['href']
-
-                        if article_date is None or (start_date <= article_date.date() <= end_date):
-                            self.data.append({
-                                'platform': 'Kompas.com',
-                                'date': start_date,
-                                'title': title,
-                                'url': link,
-                                'keyword': keyword
-                            })
-                            articles_found += 1
-                            print(f"Artikel ditemukan: {title}")
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self.started_at = datetime.now(WIB)
+        self._started = time.monotonic()
+
+    def inc(self, name, site, value=1, **labels):
+        key = (name, site or 'other', tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, site, value):
+        key = (name, site or 'other')
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * len(self.BUCKETS), 'sum': 0.0, 'count': 0, 'max': 0.0}
+            index = bisect.bisect_left(self.BUCKETS, value)
+            if index < len(self.BUCKETS):
+                histogram['buckets'][index] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+            histogram['max'] = max(histogram['max'], value)
+
+    def to_prometheus(self):
+        """Render semua metrik dalam format eksposisi teks Prometheus."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+        lines = []
+        for name, (kind, help_text) in self.METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == 'histogram':
+                for (metric, site), histogram in histograms:
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(self.BUCKETS, histogram['buckets']):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{site="{site}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{site="{site}",le="+Inf"}} {histogram["count"]}')
+                    lines.append(f'{name}_sum{{site="{site}"}} {histogram["sum"]:.6f}')
+                    lines.append(f'{name}_count{{site="{site}"}} {histogram["count"]}')
+            else:
+                for (metric, site, labels), value in counters:
+                    if metric != name:
+                        continue
+                    label_text = ','.join(f'{key}="{label}"' for key, label in (('site', site),) + labels)
+                    lines.append(f"{name}{{{label_text}}} {value:g}")
+        lines.append("# HELP scraper_run_seconds Lama run sejauh ini")
+        lines.append("# TYPE scraper_run_seconds gauge")
+        lines.append(f"scraper_run_seconds {time.monotonic() - self._started:.3f}")
+        return '\n'.join(lines) + '\n'
+
+    def summary(self):
+        """Ringkasan per situs: jumlah halaman, waktu per tahap, byte, retry dan hasil artikel."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: dict(value) for key, value in self._histograms.items()}
+        sites = {}
+        for (name, site, labels), value in counters.items():
+            entry = sites.setdefault(site, {'articles': {}})
+            if name == 'scraper_articles_total':
+                entry['articles'][dict(labels)['outcome']] = value
+            else:
+                entry[name[len('scraper_'):-len('_total')]] = value
+        for (name, site), histogram in histograms.items():
+            stage = name[len('scraper_'):-len('_seconds')]
+            entry = sites.setdefault(site, {'articles': {}})
+            entry[f"{stage}_count"] = histogram['count']
+            entry[f"{stage}_seconds"] = round(histogram['sum'], 6)
+            entry[f"{stage}_seconds_mean"] = round(histogram['sum'] / histogram['count'], 6)
+            entry[f"{stage}_seconds_max"] = round(histogram['max'], 6)
+        return {
+            'started_at': self.started_at.isoformat(),
+            'duration_seconds': round(time.monotonic() - self._started, 3),
+            'sites': sites,
+        }
 
-                        if articles_found >= max_articles:
-                            break
+    def write_prometheus(self, path):
+        _write_atomic(path, self.to_prometheus())
 
-                    except Exception as e:
-                        print(f"Error parsing artikel Kompas.com: {e}")
-                        continue
+    def write_json(self, path):
+        _write_atomic(path, json.dumps(self.summary(), indent=2, ensure_ascii=False))
 
-                page += 1
-                time.sleep(random.uniform(1, 3))
 
-            except Exception as e:
-                print(f"Error saat scraping Kompas.com: {e}")
-                break
+def _write_atomic(path, text):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
 
-        print(f"Selesai scraping Kompas.com: {articles_found} artikel ditemukan.")
 
-    def scrape_cnn(self, keyword, start_date, end_date, max_articles=50):
-        """Scrape CNNIndonesia.com berdasarkan keyword dan periode waktu."""
-        print(f"Scraping CNNIndonesia.com untuk keyword: {keyword}")
+class OnlineMediaScraper:
+    def __init__(self, fetch_backend='requests', max_in_flight=100, per_host_connections=8,
+                 parser=None, partial_parse=True, rate_limiter=None,
+                 use_cache=True, cache_ttl=3600, cache_max_bytes=512 * 1024 * 1024, offline=False,
+                 output_dir="scraped_media_data", keep_in_memory=True, skip_seen=False, since_last_run=False,
+                 include_undated=False, fetch_bodies=False, body_workers=8, parse_workers=0,
+                 browser_fallback=False, browser_pool_size=2):
+        self.data = []
+        self.output_dir = output_dir
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5'
+        }
+        self.data = []
+        self._data_lock = threading.Lock()
+        # (site_key, keyword) jobs that ended on an error, so callers can tell an outage from "nothing new"
+        self.failed_jobs = set()
+        self.keep_in_memory = keep_in_memory
+        # Undated articles cannot be checked against the date range, so they are dropped unless asked for
+        self.include_undated = include_undated
+        self.fields = RECORD_FIELDS + BODY_FIELDS if fetch_bodies else RECORD_FIELDS
+        # Optional pool of parser processes; BeautifulSoup work holds the GIL,
+        # so fetch threads only ship raw HTML there and get plain dicts back.
+        # 'spawn' avoids forking a process that already runs network threads.
+        self._parse_pool = None
+        if parse_workers:
+            log_format = 'json' if any(isinstance(h.formatter, JsonLogFormatter) for h in logger.handlers) else 'text'
+            self._parse_pool = ProcessPoolExecutor(max_workers=parse_workers,
+                                                   mp_context=multiprocessing.get_context('spawn'),
+                                                   initializer=configure_logging,
+                                                   initargs=(logger.getEffectiveLevel(), log_format))
+        self._body_executor = None
+        if fetch_bodies:
+            self._body_executor = ThreadPoolExecutor(max_workers=body_workers, thread_name_prefix="body")
+            # Backpressure: scraper threads wait when this many body jobs are already queued
+            self._body_slots = threading.BoundedSemaphore(body_workers * 4)
+            self._body_futures = set()
+        self.sink = None
+        self.metrics = ScrapeMetrics()
+        self.seen_index = SeenUrlIndex(os.path.join(self.output_dir, "seen_urls.idx")) if skip_seen else None
+        self.checkpoints = CheckpointStore(os.path.join(self.output_dir, "checkpoints.json")) if since_last_run else None
+        self.parser = parser or DEFAULT_PARSER
+        self.partial_parse = partial_parse
+        self.selector_cache = SelectorCache(os.path.join(self.output_dir, "selector_cache.json"))
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.offline = offline
+        self.cache = None
+        if use_cache or offline:
+            self.cache = ResponseCache(os.path.join(self.output_dir, "http_cache.sqlite"), cache_ttl, cache_max_bytes)
+        self.session = self._build_session(per_host_connections)
+        # Sites whose search pages only have results after JavaScript runs are
+        # switched to the headless browser pool once the static HTML comes back empty
+        self.browser = None
+        if browser_fallback and not offline:
+            self.browser = BrowserFetcher(browser_pool_size, user_agent=self.headers['User-Agent'])
+        self._static_sites = set()
+        self._browser_sites = set()
+        self._sites_lock = threading.Lock()
+        self.fetcher = None
+        if fetch_backend == 'async':
+            self.fetcher = AsyncFetcher(self.headers, max_in_flight, per_host_connections, rate_limiter=self.rate_limiter)
+        elif fetch_backend != 'requests':
+            raise ValueError(f"Backend fetch tidak dikenal: {fetch_backend}")
+
+    def _build_session(self, pool_maxsize):
+        """Buat satu requests.Session berumur panjang dengan connection pool dan retry."""
+        session = requests.Session()
+        session.headers.update(self.headers)
+        retries = Retry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF_FACTOR, status_forcelist=RETRY_STATUS_FORCELIST)
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize, max_retries=retries)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def fetch(self, url, timeout=10, site_key=None):
+        """Ambil satu halaman, lewat cache respons bila aktif; site_key dipakai sebagai label metrik."""
+        cached, entry = self._cache_lookup(url)
+        if cached is not None:
+            self.metrics.inc('scraper_cache_hits_total', site_key)
+            return cached
+        headers = self.cache.revalidation_headers(entry) if entry is not None else None
+        response = self._fetch_network(url, timeout, headers, site_key)
+        return self._cache_store(url, entry, response)
+
+    def fetch_many(self, urls, timeout=10, site_key=None):
+        """Ambil banyak halaman sekaligus; berjalan paralel bila backend async aktif."""
+        results = {}
+        pending = []
+        for url in urls:
+            cached, entry = self._cache_lookup(url)
+            if cached is not None:
+                self.metrics.inc('scraper_cache_hits_total', site_key)
+                results[url] = cached
+            else:
+                pending.append((url, entry))
+
+        headers = [self.cache.revalidation_headers(entry) if entry is not None else None for _, entry in pending]
+        if self.fetcher is not None:
+            fetched = self.fetcher.fetch_many([url for url, _ in pending], timeout, headers)
+            for response in fetched:
+                if isinstance(response, Exception):
+                    self.metrics.inc('scraper_fetch_errors_total', site_key)
+                else:
+                    self._record_fetch(site_key, response, response.latency, response.slept)
+        else:
+            fetched = []
+            for (url, _), url_headers in zip(pending, headers):
+                try:
+                    fetched.append(self._fetch_network(url, timeout, url_headers, site_key))
+                except Exception as e:
+                    fetched.append(e)
+
+        for (url, entry), response in zip(pending, fetched):
+            results[url] = response if isinstance(response, Exception) else self._cache_store(url, entry, response)
+        return [results[url] for url in urls]
+
+    def _cache_lookup(self, url):
+        """Kembalikan (respons dari cache atau None, entri cache untuk revalidasi)."""
+        if self.cache is None:
+            return None, None
+        entry = self.cache.get(url)
+        if entry is not None and (self.offline or self.cache.is_fresh(entry)):
+            return self.cache.to_result(entry), entry
+        if self.offline:
+            return FetchResult(url, 504, '', {'X-Offline': 'miss'}), None
+        return None, entry
+
+    def _cache_store(self, url, entry, response):
+        """Simpan respons baru ke cache, atau pakai entri lama jika server menjawab 304."""
+        if self.cache is None:
+            return response
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(url)
+            return self.cache.to_result(entry)
+        if response.status_code == 200:
+            self.cache.put(url, response)
+        return response
+
+    def _fetch_network(self, url, timeout=10, headers=None, site_key=None):
+        """Ambil satu halaman dari jaringan melalui backend fetch yang aktif."""
+        if self.fetcher is not None:
+            # The async backend applies the rate limiter itself, per attempt
+            try:
+                response = self.fetcher.fetch(url, timeout, headers)
+            except Exception:
+                self.metrics.inc('scraper_fetch_errors_total', site_key)
+                raise
+            self._record_fetch(site_key, response, response.latency, response.slept)
+            return response
+        slept = self.rate_limiter.acquire(url)
+        start = time.monotonic()
+        try:
+            response = self.session.get(url, timeout=timeout, headers=headers)
+        except Exception:
+            self.rate_limiter.record(url, None, time.monotonic() - start)
+            self.metrics.inc('scraper_fetch_errors_total', site_key)
+            raise
+        latency = time.monotonic() - start
+        self.rate_limiter.record(url, response.status_code, latency, response.headers.get('Retry-After'))
+        self._record_fetch(site_key, response, latency, slept)
+        return response
+
+    def _record_fetch(self, site_key, response, latency, slept):
+        """Catat latensi, byte, retry dan waktu tidur satu fetch jaringan."""
+        self.metrics.observe('scraper_fetch_seconds', site_key, latency)
+        content = getattr(response, 'content', None)
+        self.metrics.inc('scraper_fetch_bytes_total', site_key,
+                         len(content) if content is not None else len(response.text.encode('utf-8')))
+        # urllib3 keeps the retry history on the raw response; FetchResult carries its own count
+        retry_state = getattr(getattr(response, 'raw', None), 'retries', None)
+        retries = len(retry_state.history) if retry_state is not None else getattr(response, 'retries', 0)
+        if retries:
+            self.metrics.inc('scraper_fetch_retries_total', site_key, retries)
+        if slept:
+            self.metrics.inc('scraper_rate_limit_sleep_seconds_total', site_key, slept)
+
+    def open_sink(self, path, fmt=None, flush_every=20):
+        """Aktifkan output streaming: setiap artikel langsung ditulis ke path."""
+        self.sink = RecordSink(path, fmt, flush_every, fields=self.fields)
+        logger.info("Output streaming ke: %s", path)
+        return self.sink
+
+    def close(self):
+        """Tutup koneksi backend fetch dan output streaming."""
+        self.drain_pipeline()
+        if self._body_executor is not None:
+            self._body_executor.shutdown(wait=True)
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=True)
+        if self.sink is not None:
+            self.sink.close()
+            # Streamed records are already on disk, so progress can be committed
+            self.commit_progress()
+        if self.fetcher is not None:
+            self.fetcher.close()
+            self.fetcher = None
+        if self.browser is not None:
+            self.browser.close()
+            self.browser = None
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+    def commit_progress(self):
+        """Simpan indeks URL dan checkpoint run ini ke disk (setelah output tersimpan)."""
+        if self.seen_index is not None:
+            self.seen_index.flush()
+        if self.checkpoints is not None:
+            self.checkpoints.save()
+
+    def _add_article(self, record):
+        """Terima satu artikel; jika tahap isi artikel aktif, artikel dikirim ke sana dulu."""
+        if self._body_executor is None:
+            self._emit(record)
+            return
+        self._body_slots.acquire()
+        future = self._body_executor.submit(self._enrich_and_emit, record)
+        with self._data_lock:
+            self._body_futures.add(future)
+        future.add_done_callback(self._body_done)
+
+    def _body_done(self, future):
+        with self._data_lock:
+            self._body_futures.discard(future)
+        self._body_slots.release()
+
+    def _emit(self, record):
+        """Tulis artikel final ke sink streaming dan/atau simpan di self.data (thread-safe)."""
+        if self.sink is not None:
+            self.sink.write(record)
+        if self.keep_in_memory:
+            with self._data_lock:
+                self.data.append(record)
+
+    def enrich_record(self, record):
+        """Lengkapi record dengan isi, penulis dan tag artikel (memakai Session, cache dan rate limiter)."""
+        site_key = next((key for key, site in SITES.items() if site['platform'] == record['platform']), None)
+        site = SITES.get(site_key, {})
+        response = self.fetch(record['url'], timeout=15, site_key=site_key)
+        response.raise_for_status()
+        record.update(self._parse(extract_article_body, site, response.text, self.parser))
+        return record
+
+    def _enrich_and_emit(self, record):
+        try:
+            self.enrich_record(record)
+        except Exception as e:
+            logger.warning("Error mengambil isi artikel %s: %s", record['url'], e)
+        self._emit(record)
+
+    def drain_pipeline(self):
+        """Tunggu semua job isi artikel yang masih berjalan selesai."""
+        if self._body_executor is None:
+            return
+        while True:
+            with self._data_lock:
+                pending = list(self._body_futures)
+            if not pending:
+                return
+            for future in pending:
+                future.result()
+
+    def _parse(self, func, *args):
+        """Jalankan fungsi parse di pool proses parser jika aktif, atau langsung di thread ini."""
+        if self._parse_pool is None:
+            return func(*args)
+        return self._parse_pool.submit(func, *args).result()
+
+    def _parse_page(self, site_key, html):
+        parse_start = time.perf_counter()
+        result = self._parse(parse_search_page, site_key, html, self.parser,
+                             self.partial_parse, self.selector_cache.get(site_key))
+        self.metrics.observe('scraper_parse_seconds', site_key, time.perf_counter() - parse_start)
+        self.metrics.inc('scraper_pages_total', site_key)
+        return result
+
+    def _fetch_rendered(self, site_key, url, timeout):
+        """Ambil halaman lewat pool browser headless, tetap mematuhi rate limiter per host."""
+        slept = self.rate_limiter.acquire(url)
+        start = time.monotonic()
+        response = self.browser.fetch(url, timeout=max(timeout, 30))
+        latency = time.monotonic() - start
+        # The fixed render wait is not server latency and must not slow down the host's static path
+        self.rate_limiter.record(url, response.status_code, max(0.0, latency - self.browser.render_wait))
+        self.metrics.inc('scraper_browser_fetches_total', site_key)
+        self._record_fetch(site_key, response, latency, slept)
+        return response
+
+    def _load_search_page(self, site_key, search_url, first=False):
+        """Ambil dan parse satu halaman pencarian menjadi daftar field artikel.
+
+        Mengembalikan None jika halaman tidak ada atau tidak berisi artikel; dalam
+        mode offline juga jika halaman lanjutan (bukan first) tidak ada di cache.
+        Pengambilan ulang halaman yang sama dicegah oleh cache respons (dengan TTL).
+        """
+        site = SITES[site_key]
+        rendered = site_key in self._browser_sites
+        if rendered:
+            response = self._fetch_rendered(site_key, search_url, site['timeout'])
+        else:
+            response = self.fetch(search_url, timeout=site['timeout'], site_key=site_key)
+        site_logger(site_key).debug("Status kode untuk %s: %s", search_url, response.status_code)
+        if response.status_code == 404:
+            site_logger(site_key).info("Halaman tidak ditemukan untuk URL: %s", search_url)
+            return None
+        # Offline, a later page missing from the cache is where the recorded listing ended;
+        # only a missing first page means nothing was recorded at all
+        if not first and response.headers.get('X-Offline') == 'miss':
+            site_logger(site_key).info("Halaman tidak ada di cache offline, hasil rekaman berakhir: %s", search_url)
+            return None
+        response.raise_for_status()
+
+        items, selector = self._parse_page(site_key, response.text)
+        # Once the static HTML has produced results, an empty page just means the end of the results
+        if not selector and not rendered and self.browser is not None and site_key not in self._static_sites:
+            site_logger(site_key).info("HTML statis %s tanpa artikel, mencoba browser headless.", site['platform'])
+            response = self._fetch_rendered(site_key, search_url, site['timeout'])
+            items, selector = self._parse_page(site_key, response.text)
+            rendered = True
+        if not selector:
+            return None
+        self.selector_cache.set(site_key, selector)
+        with self._sites_lock:
+            (self._browser_sites if rendered else self._static_sites).add(site_key)
+
+        fetched_at = getattr(response, 'fetched_at', None) or datetime.now(WIB)
+        for item in items:
+            item['fetched_at'] = fetched_at
+        return items
+
+    def scrape_site(self, site_key, keyword, start_date, end_date, max_articles=50,
+                    first_page=1, last_page=None, strict=False):
+        """Scrape satu situs dari SITES berdasarkan keyword dan periode waktu.
+
+        first_page/last_page membatasi rentang halaman (untuk job antrian);
+        strict=True meneruskan error halaman ke pemanggil alih-alih berhenti diam-diam.
+        """
+        site = SITES[site_key]
+        platform = site['platform']
+        log = site_logger(site_key, keyword)
+        metrics = self.metrics
+        log.info("Scraping %s untuk keyword: %s", platform, keyword)
         encoded_keyword = urllib.parse.quote(keyword)
-        page = 1
+        page = first_page
         articles_found = 0
         keyword_lower = keyword.lower()
+        checkpoint_date, checkpoint_urls = (None, set())
+        # Checkpoints describe a run from the top of the listing; page-range jobs
+        # starting further down must neither stop on them nor move them
+        use_checkpoint = self.checkpoints is not None and first_page == 1
+        if use_checkpoint:
+            checkpoint_date, checkpoint_urls = self.checkpoints.get(site_key, keyword)
+            if checkpoint_date is not None and end_date < checkpoint_date.astimezone(WIB).date():
+                # A backfill of a window older than the checkpoint would stop on its first article
+                log.info("Periode berakhir sebelum checkpoint %s, checkpoint %s tidak dipakai.", checkpoint_date, platform)
+                use_checkpoint = False
+                checkpoint_date, checkpoint_urls = (None, set())
+        collected_urls = []
+        newest_date = None
+        reached_checkpoint = False
+        # Whether pagination got to the checkpoint, past the window or to the end of the results;
+        # only then is everything newer than the checkpoint known to be collected
+        exhausted = False
+        if site.get('date_search_url'):
+            url_template = site['date_search_url']
+            sorted_by_date = site.get('date_search_sorted', False)
+        else:
+            url_template = site['search_url']
+            sorted_by_date = site.get('sorted_by_date', False)
 
-        while articles_found < max_articles:
-            search_url = f"https://www.cnnindonesia.com/search/?query={encoded_keyword}&page={page}"
+        while articles_found < max_articles and not reached_checkpoint and (last_page is None or page <= last_page):
+            search_url = url_template.format(keyword=encoded_keyword, page=page, start=start_date, end=end_date)
             try:
-                response = requests.get(search_url, headers=self.headers, timeout=10)
-                print(f"Status kode untuk halaman {page}: {response.status_code}")
-                if response.status_code == 404:
-                    print(f"Halaman tidak ditemukan untuk URL: {search_url}")
-                    break
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-
-                # class_names = ['list', 'article', 'news-item', 'media__item']
-                class_names = ['nhl-box', 'article-list', 'list-news', 'article-item', 'list', 'article', 'news-item', 'media__item']
-                articles = None
-                for class_name in class_names:
-                    articles = soup.find_all('article', class_=class_name) or soup.find_all('div', class_=class_name)
-                    if articles:
-                        print(f"Ditemukan artikel dengan class: {class_name}")
-                        break
-
-                if not articles:
-                    print("Tidak ditemukan artikel. Mencoba mencari class lain...")
-                    divs_with_class = soup.find_all(['div', 'article'], class_=True)
-                    unique_classes = set(div['class'][0] for div in divs_with_class if div.get('class'))
-                    print(f"Class unik yang ditemukan: {unique_classes}")
-                    print("Tidak ada artikel lagi di CNNIndonesia.com atau halaman habis.")
+                items = self._load_search_page(site_key, search_url, first=page == 1)
+                if items is None:
+                    log.info("Tidak ada artikel lagi di %s atau halaman habis.", platform)
+                    exhausted = True
                     break
 
-                print(f"Halaman {page}: Ditemukan {len(articles)} artikel.")
+                log.debug("Halaman %d: Ditemukan %d artikel.", page, len(items))
+
+                page_dates = [
+                    parse_article_date_detailed(item['date_str'], site_key, now=item['fetched_at'])
+                    for item in items
+                ]
+                # The window and the 'date' column use the WIB calendar day, whatever zone the site printed
+                days = [article_date.astimezone(WIB).date() for article_date, _ in page_dates if article_date is not None]
+                older = sum(1 for day in days if day < start_date)
 
-                for article in articles:
+                matched = known = 0
+                for item, (article_date, date_confidence) in zip(items, page_dates):
+                    article_day = article_date.astimezone(WIB).date() if article_date else None
                     try:
-                        title_tag = article.find('h2', class_='title') or article.find('h3', class_='title')
-                        date_tag = article.find('span', class_='date') or article.find('div', class_='date')
-                        link_tag = article.find('a', href=True)
+                        if not (item['title'] and item['link']):
+                            log.debug("Artikel tidak memiliki elemen lengkap (judul atau tautan). Missing: title=%s, link=%s, date=%s",
+                                      not item['title'], not item['link'], not item['date_str'])
+                            metrics.inc('scraper_articles_total', site_key, outcome='incomplete')
+                            continue
 
-                        if not (title_tag and link_tag):
-                            print(f"Artikel tidak memiliki elemen lengkap (judul atau tautan). Missing: title={not title_tag}, link={not link_tag}, date={not date_tag}")
+                        title = item['title']
+                        if keyword_lower not in title.lower() and keyword_lower not in item['summary'].lower():
+                            log.debug("Judul tidak mengandung keyword '%s': %s", keyword, title)
+                            metrics.inc('scraper_articles_total', site_key, outcome='keyword_mismatch')
                             continue
 
-                        title = title_tag.text.strip()
-                        if keyword_lower not in title.lower():
-                            print(f"Judul tidak mengandung keyword '{keyword}': {title}")
+                        matched += 1
+                        if item['link'] in checkpoint_urls:
+                            # Only a newest-first listing guarantees that everything below is old too;
+                            # relevance-ranked pages mix known and new articles
+                            if sorted_by_date:
+                                log.info("Mencapai artikel dari run sebelumnya di %s: %s", platform, item['link'])
+                                reached_checkpoint = True
+                                break
+                            known += 1
+                            log.debug("Artikel dari run sebelumnya dilewati: %s", item['link'])
+                            metrics.inc('scraper_articles_total', site_key, outcome='seen')
+                            continue
+                        if self.seen_index is not None and self.seen_index.contains(item['link']):
+                            known += 1
+                            log.debug("Artikel sudah pernah dikumpulkan: %s", item['link'])
+                            metrics.inc('scraper_articles_total', site_key, outcome='seen')
                             continue
 
-                        link = link_tag['href']
-
-                        article_date = None
-                        if date_tag:
-                            date_str = date_tag.text.strip()
-                            print(f"Raw date string: {date_str}")
-                            try:
-                                article_date = datetime.strptime(date_str, '%d %b %Y %H:%M')
-                            except ValueError:
-                                try:
-                                    article_date = datetime.strptime(date_str, '%d/%m/%Y %H:%M')
-                                except ValueError as e:
-                                    print(f"Error parsing date: {e}, Raw date: {date_str}")
-                                    article_date = None
-
-                        if article_date is None or (start_date <= article_date.date() <= end_date):
-                            self.data.append({
-                                'platform': 'CNNIndonesia.com',
-                                'date': start_date,
-                                'title': title,
-                                'url': link,
-                                'keyword': keyword
-                            })
-                            articles_found += 1
-                            print(f"Artikel ditemukan: {title}")
+                        if item['date_str'] and article_date is None:
+                            log.warning("Error parsing date: Tidak ada format yang cocok, Raw date: %s", item['date_str'])
 
-                        if articles_found >= max_articles:
+                        # On date-sorted result pages, anything at or before the checkpoint is old news
+                        if sorted_by_date and checkpoint_date and article_date and article_date <= checkpoint_date:
+                            log.info("Mencapai tanggal checkpoint %s di %s.", checkpoint_date, platform)
+                            reached_checkpoint = True
+                            break
+                        # ...and everything after the first article older than the window is older too
+                        if sorted_by_date and article_day and article_day < start_date:
+                            metrics.inc('scraper_articles_total', site_key, outcome='out_of_range')
                             break
 
-                    except Exception as e:
-                        print(f"Error parsing artikel CNNIndonesia.com: {e}")
-                        continue
-
-                page += 1
-                time.sleep(random.uniform(1, 3))
-
-            except Exception as e:
-                print(f"Error saat scraping CNNIndonesia.com: {e}")
-                break
-
-        print(f"Selesai scraping CNNIndonesia.com: {articles_found} artikel ditemukan.")
-
-    def scrape_tempo(self, keyword, start_date, end_date, max_articles=50):
-        """Scrape Tempo.co berdasarkan keyword dan periode waktu."""
-        print(f"Scraping Tempo.co untuk keyword: {keyword}")
-        encoded_keyword = urllib.parse.quote(keyword)
-        page = 1
-        articles_found = 0
-        keyword_lower = keyword.lower()
-
-        while articles_found < max_articles:
-            search_url = f"https://www.tempo.co/search?q={encoded_keyword}&page={page}"
-            try:
-                response = requests.get(search_url, headers=self.headers, timeout=10)
-                print(f"Status kode untuk halaman {page}: {response.status_code}")
-                if response.status_code == 404:
-                    print(f"Halaman tidak ditemukan untuk URL: {search_url}")
-                    break
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-
-                class_names = ['card', 'article', 'list-item', 'news-item']
-                articles = None
-                for class_name in class_names:
-                    articles = soup.find_all('div', class_=class_name) or soup.find_all('article', class_=class_name)
-                    if articles:
-                        print(f"Ditemukan artikel dengan class: {class_name}")
-                        break
-
-                if not articles:
-                    print("Tidak ditemukan artikel. Mencoba mencari class lain...")
-                    divs_with_class = soup.find_all(['div', 'article'], class_=True)
-                    unique_classes = set(div['class'][0] for div in divs_with_class if div.get('class'))
-                    print(f"Class unik yang ditemukan: {unique_classes}")
-                    print("Tidak ada artikel lagi di Tempo.co atau halaman habis.")
-                    break
-
-                print(f"Halaman {page}: Ditemukan {len(articles)} artikel.")
-
-                for article in articles:
-                    try:
-                        title_tag = article.find('h2', class_='title') or article.find('h3', class_='title') or article.find('h2', class_='judul')
-                        date_tag = article.find('span', class_='date') or article.find('div', class_='date') or article.find('span', class_='tanggal')
-                        link_tag = article.find('a', href=True)
-
-                        if not (title_tag and link_tag):
-                            print(f"Artikel tidak memiliki elemen lengkap (judul atau tautan). Missing: title={not title_tag}, link={not link_tag}, date={not date_tag}")
-                            continue
-
-                        title = title_tag.text.strip()
-                        if keyword_lower not in title.lower():
-                            print(f"Judul tidak mengandung keyword '{keyword}': {title}")
+                        if article_date is None and not self.include_undated:
+                            log.debug("Artikel tanpa tanggal dilewati: %s", title)
+                            metrics.inc('scraper_articles_total', site_key, outcome='undated')
                             continue
 
-                        link = link_tag['href']
-
-                        article_date = None
-                        if date_tag:
-                            date_str = date_tag.text.strip()
-                            print(f"Raw date string: {date_str}")
-                            try:
-                                article_date = datetime.strptime(date_str, '%d %b %Y, %H:%M WIB')
-                            except ValueError:
-                                try:
-                                    article_date = datetime.strptime(date_str, '%d/%m/%Y %H:%M')
-                                except ValueError as e:
-                                    print(f"Error parsing date: {e}, Raw date: {date_str}")
-                                    article_date = None
-
-                        if article_date is None or (start_date <= article_date.date() <= end_date):
-                            self.data.append({
-                                'platform': 'Tempo.co',
-                                'date': start_date,
+                        if article_date is None or (start_date <= article_day <= end_date):
+                            if self.seen_index is not None and not self.seen_index.add(item['link']):
+                                metrics.inc('scraper_articles_total', site_key, outcome='duplicate')
+                                continue
+                            self._add_article({
+                                'platform': platform,
+                                'date': article_day,
+                                'published_at': article_date,
+                                'fetched_at': item['fetched_at'],
+                                'date_confidence': date_confidence,
                                 'title': title,
-                                'url': link,
+                                'url': item['link'],
                                 'keyword': keyword
                             })
                             articles_found += 1
-                            print(f"Artikel ditemukan: {title}")
+                            collected_urls.append(item['link'])
+                            if article_date and (newest_date is None or article_date > newest_date):
+                                newest_date = article_date
+                            metrics.inc('scraper_articles_total', site_key, outcome='accepted')
+                            log.debug("Artikel ditemukan: %s", title)
+                        else:
+                            metrics.inc('scraper_articles_total', site_key, outcome='out_of_range')
 
                         if articles_found >= max_articles:
                             break
 
                     except Exception as e:
-                        print(f"Error parsing artikel Tempo.co: {e}")
+                        log.warning("Error memproses artikel %s: %s", platform, e)
                         continue
 
-                page += 1
-                time.sleep(random.uniform(1, 3))
-
-            except Exception as e:
-                print(f"Error saat scraping Tempo.co: {e}")
-                break
-
-        print(f"Selesai scraping Tempo.co: {articles_found} artikel ditemukan.")
-
-    def scrape_liputan6(self, keyword, start_date, end_date, max_articles=50):
-        """Scrape Liputan6.com berdasarkan keyword dan periode waktu."""
-        print(f"Scraping Liputan6.com untuk keyword: {keyword}")
-        encoded_keyword = urllib.parse.quote(keyword)
-        page = 1
-        articles_found = 0
-        keyword_lower = keyword.lower()
-
-        while articles_found < max_articles:
-            search_url = f"https://www.liputan6.com/search?q={encoded_keyword}&page={page}"
-            try:
-                response = requests.get(search_url, headers=self.headers, timeout=10)
-                print(f"Status kode untuk halaman {page}: {response.status_code}")
-                if response.status_code == 404:
-                    print(f"Halaman tidak ditemukan untuk URL: {search_url}")
+                if reached_checkpoint:
+                    exhausted = True
                     break
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-
-                class_names = ['articles--item', 'article', 'list-item', 'news-item']
-                articles = None
-                for class_name in class_names:
-                    articles = soup.find_all('article', class_=class_name) or soup.find_all('div', class_=class_name)
-                    if articles:
-                        print(f"Ditemukan artikel dengan class: {class_name}")
-                        break
-
-                if not articles:
-                    print("Tidak ditemukan artikel. Mencoba mencari class lain...")
-                    divs_with_class = soup.find_all(['div', 'article'], class_=True)
-                    unique_classes = set(div['class'][0] for div in divs_with_class if div.get('class'))
-                    print(f"Class unik yang ditemukan: {unique_classes}")
-                    print("Tidak ada artikel lagi di Liputan6.com atau halaman habis.")
+                if articles_found >= max_articles:
+                    break
+                if matched and known == matched:
+                    log.info("Semua artikel di halaman %d sudah pernah dikumpulkan, berhenti di %s.", page, platform)
+                    exhausted = True
+                    break
+                if days and (older == len(days) or (sorted_by_date and older)):
+                    log.info("Artikel di halaman %d sudah lebih lama dari %s, berhenti di %s.", page, start_date, platform)
+                    exhausted = True
                     break
-
-                print(f"Halaman {page}: Ditemukan {len(articles)} artikel.")
-
-                for article in articles:
-                    try:
-                        title_tag = article.find('h4', class_='articles--title') or article.find('h3', class_='articles--title') or article.find('h2', class_='title')
-                        date_tag = article.find('span', class_='articles--date') or article.find('div', class_='articles--date') or article.find('time')
-                        link_tag = article.find('a', href=True)
-
-                        if not (title_tag and link_tag):
-                            print(f"Artikel tidak memiliki elemen lengkap (judul atau tautan). Missing: title={not title_tag}, link={not link_tag}, date={not date_tag}")
-                            continue
-
-                        title = title_tag.text.strip()
-                        if keyword_lower not in title.lower():
-                            print(f"Judul tidak mengandung keyword '{keyword}': {title}")
-                            continue
-
-                        link = link_tag['href']
-
-                        article_date = None
-                        if date_tag:
-                            date_str = date_tag.text.strip()
-                            print(f"Raw date string: {date_str}")
-                            try:
-                                article_date = datetime.strptime(date_str, '%d %b %Y, %H:%M WIB')
-                            except ValueError:
-                                try:
-                                    article_date = datetime.strptime(date_str, '%d/%m/%Y %H:%M')
-                                except ValueError as e:
-                                    print(f"Error parsing date: {e}, Raw date: {date_str}")
-                                    article_date = None
-
-                        if article_date is None or (start_date <= article_date.date() <= end_date):
-                            self.data.append({
-                                'platform': 'Liputan6.com',
-                                'date': start_date,
-                                'title': title,
-                                'url': link,
-                                'keyword': keyword
-                            })
-                            articles_found += 1
-                            print(f"Artikel ditemukan: {title}")
-
-                        if articles_found >= max_articles:
-                            break
-
-                    except Exception as e:
-                        print(f"Error parsing artikel Liputan6.com: {e}")
-                        continue
 
                 page += 1
-                time.sleep(random.uniform(1, 3))
 
             except Exception as e:
-                print(f"Error saat scraping Liputan6.com: {e}")
+                log.error("Error saat scraping %s: %s", platform, e)
+                if strict:
+                    raise
+                self._record_failure(site_key, keyword)
+                exhausted = False
                 break
 
-        print(f"Selesai scraping Liputan6.com: {articles_found} artikel ditemukan.")
+        if use_checkpoint and exhausted:
+            self.checkpoints.update(site_key, keyword, collected_urls, newest_date)
+        elif use_checkpoint:
+            # Stopped early (max_articles, last_page or an error): moving the checkpoint now would make
+            # the next run stop above the articles this run never reached
+            log.debug("Pencarian %s belum sampai checkpoint, checkpoint tidak diperbarui.", platform)
+        log.info("Selesai scraping %s: %d artikel ditemukan.", platform, articles_found)
+        return articles_found
 
-    def scrape_viva(self, keyword, start_date, end_date, max_articles=50):
-        """Scrape Viva.co.id berdasarkan keyword dan periode waktu."""
-        print(f"Scraping Viva.co.id untuk keyword: {keyword}")
-        encoded_keyword = urllib.parse.quote(keyword)
-        page = 1
-        articles_found = 0
-        keyword_lower = keyword.lower()
+    def _record_failure(self, site_key, keyword):
+        with self._data_lock:
+            self.failed_jobs.add((site_key, keyword))
 
-        while articles_found < max_articles:
-            search_url = f"https://www.viva.co.id/search?q={encoded_keyword}&page={page}"
-            try:
-                response = requests.get(search_url, headers=self.headers, timeout=10)
-                print(f"Status kode untuk halaman {page}: {response.status_code}")
-                if response.status_code == 404:
-                    print(f"Halaman tidak ditemukan untuk URL: {search_url}")
-                    break
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-
-                # Try possible class names for article containers
-                class_names = ['article-list', 'article', 'list-item', 'news-item']
-                articles = None
-                for class_name in class_names:
-                    articles = soup.find_all('div', class_=class_name) or soup.find_all('article', class_=class_name)
-                    if articles:
-                        print(f"Ditemukan artikel dengan class: {class_name}")
-                        break
-
-                if not articles:
-                    print("Tidak ditemukan artikel. Mencoba mencari class lain...")
-                    divs_with_class = soup.find_all(['div', 'article'], class_=True)
-                    unique_classes = set(div['class'][0] for div in divs_with_class if div.get('class'))
-                    print(f"Class unik yang ditemukan: {unique_classes}")
-                    print("Tidak ada artikel lagi di Viva.co.id atau halaman habis.")
-                    break
-
-                print(f"Halaman {page}: Ditemukan {len(articles)} artikel.")
-
-                for article in articles:
-                    try:
-                        title_tag = article.find('h3', class_='title') or article.find('h4', class_='title') or article.find('h2', class_='article-title')
-                        date_tag = article.find('span', class_='date') or article.find('div', class_='date') or article.find('time')
-                        link_tag = article.find('a', href=True)
-
-                        if not (title_tag and link_tag):
-                            print(f"Artikel tidak memiliki elemen lengkap (judul atau tautan). Missing: title={not title_tag}, link={not link_tag}, date={not date_tag}")
-                            continue
-
-                        title = title_tag.text.strip()
-                        if keyword_lower not in title.lower():
-                            print(f"Judul tidak mengandung keyword '{keyword}': {title}")
-                            continue
-
-                        link = link_tag['href']
-
-                        # Parse date for filtering, use None if missing
-                        article_date = None
-                        if date_tag:
-                            date_str = date_tag.text.strip()
-                            print(f"Raw date string: {date_str}")
-                            try:
-                                # Viva.co.id dates might be like "14 Mei 2025, 09:00 WIB" or "14/05/2025 09:00"
-                                article_date = datetime.strptime(date_str, '%d %b %Y, %H:%M WIB')
-                            except ValueError:
-                                try:
-                                    article_date = datetime.strptime(date_str, '%d/%m/%Y %H:%M')
-                                except ValueError as e:
-                                    print(f"Error parsing date: {e}, Raw date: {date_str}")
-                                    article_date = None
-
-                        if article_date is None or (start_date <= article_date.date() <= end_date):
-                            self.data.append({
-                                'platform': 'Viva.co.id',
-                                'date': start_date,
-                                'title': title,
-                                'url': link,
-                                'keyword': keyword
-                            })
-                            articles_found += 1
-                            print(f"Artikel ditemukan: {title}")
+    def scrape_detik(self, keyword, start_date, end_date, max_articles=50):
+        """Scrape Detik.com berdasarkan keyword dan periode waktu."""
+        return self.scrape_site('detik', keyword, start_date, end_date, max_articles)
 
-                        if articles_found >= max_articles:
-                            break
+    def scrape_kompas(self, keyword, start_date, end_date, max_articles=50):
+        """Scrape Kompas.com berdasarkan keyword dan periode waktu."""
+        return self.scrape_site('kompas', keyword, start_date, end_date, max_articles)
 
-                    except Exception as e:
-                        print(f"Error parsing artikel Viva.co.id: {e}")
-                        continue
+    def scrape_cnn(self, keyword, start_date, end_date, max_articles=50):
+        """Scrape CNNIndonesia.com berdasarkan keyword dan periode waktu."""
+        return self.scrape_site('cnn', keyword, start_date, end_date, max_articles)
 
-                page += 1
-                time.sleep(random.uniform(1, 3))
+    def scrape_tempo(self, keyword, start_date, end_date, max_articles=50):
+        """Scrape Tempo.co berdasarkan keyword dan periode waktu."""
+        return self.scrape_site('tempo', keyword, start_date, end_date, max_articles)
 
-            except Exception as e:
-                print(f"Error saat scraping Viva.co.id: {e}")
-                break
+    def scrape_liputan6(self, keyword, start_date, end_date, max_articles=50):
+        """Scrape Liputan6.com berdasarkan keyword dan periode waktu."""
+        return self.scrape_site('liputan6', keyword, start_date, end_date, max_articles)
 
-        print(f"Selesai scraping Viva.co.id: {articles_found} artikel ditemukan.")
+    def scrape_viva(self, keyword, start_date, end_date, max_articles=50):
+        """Scrape Viva.co.id berdasarkan keyword dan periode waktu."""
+        return self.scrape_site('viva', keyword, start_date, end_date, max_articles)
 
     def scrape_antara(self, keyword, start_date, end_date, max_articles=50):
         """Scrape AntaraNews.com berdasarkan keyword dan periode waktu."""
-        print(f"Scraping AntaraNews.com untuk keyword: {keyword}")
-        encoded_keyword = urllib.parse.quote(keyword)
-        page = 1
-        articles_found = 0
-        keyword_lower = keyword.lower()
-
-        while articles_found < max_articles:
-            search_url = f"https://www.antaranews.com/search?q={encoded_keyword}&page={page}"
+        return self.scrape_site('antara', keyword, start_date, end_date, max_articles)
+
+    def scrape_all(self, keyword, start_date, end_date, max_articles=50, max_workers=None, sites=None):
+        """Scrape semua situs secara bersamaan, masing-masing di worker terpisah."""
+        sites = list(sites or SITES)
+        max_workers = max_workers or len(sites)
+        logger.info("Scraping %d situs secara bersamaan dengan %d worker", len(sites), max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.scrape_site, site_key, keyword, start_date, end_date, max_articles): site_key
+                for site_key in sites
+            }
+            for future in as_completed(futures):
+                # A failing site must not take the other workers down with it
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error("Error pada %s: %s", futures[future], e)
+                    self._record_failure(futures[future], keyword)
+        self.drain_pipeline()
+
+    def scrape_batch(self, keywords, start_date, end_date, max_articles=50, max_workers=None, sites=None):
+        """Scrape banyak keyword sekaligus; semua job keyword x situs dijadwalkan bersama.
+
+        Keyword duplikat (beda huruf besar/spasi) hanya di-scrape sekali, dan
+        Session dan cache respons dipakai bersama oleh semua job. Dengan backend
+        async, jumlah worker mengikuti max_in_flight.
+        """
+        unique_keywords = {}
+        for keyword in keywords:
+            keyword = ' '.join(keyword.split())
+            if keyword:
+                unique_keywords.setdefault(keyword.lower(), keyword)
+        keywords = list(unique_keywords.values())
+        sites = list(dict.fromkeys(sites or SITES))
+        jobs = [(keyword, site_key) for keyword in keywords for site_key in sites]
+        max_workers = max_workers or len(sites)
+        if self.fetcher is not None:
+            # Each job waits on one page at a time, so with the async backend the thread count is
+            # what actually bounds requests in flight; size it from max_in_flight instead
+            max_workers = max(max_workers, min(len(jobs), self.fetcher.max_in_flight))
+        logger.info("Scraping %d keyword x %d situs (%d job) dengan %d worker",
+                    len(keywords), len(sites), len(jobs), max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.scrape_site, site_key, keyword, start_date, end_date, max_articles): (keyword, site_key)
+                for keyword, site_key in jobs
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error("Error pada %s: %s", futures[future], e)
+                    keyword, site_key = futures[future]
+                    self._record_failure(site_key, keyword)
+        self.drain_pipeline()
+        return keywords
+
+    def _output_path(self, filename_prefix, extension):
+        """Nama file output default: prefix, timestamp dan PID agar shard paralel tidak bertabrakan."""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return os.path.join(self.output_dir, f"{filename_prefix}_{timestamp}_{os.getpid()}.{extension}")
+
+    def run_queue_worker(self, queue, worker_id=None, poll_interval=5.0, stop_when_empty=True):
+        """Ambil dan kerjakan job dari JobQueue sampai antrian habis; kembalikan jumlah job yang selesai.
+
+        Lease diperpanjang di background selama job berjalan. Record hasil
+        dikirim ke antrian dan dibuang dari memori worker setelah job selesai.
+        """
+        worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        done = 0
+        while True:
+            job = queue.lease(worker_id)
+            if job is None:
+                counts = queue.counts()
+                if stop_when_empty and not counts.get('pending') and not counts.get('leased'):
+                    return done
+                time.sleep(poll_interval)
+                continue
+
+            logger.info("Worker %s mengerjakan job %d: %s/%s halaman %s-%s (percobaan %d)", worker_id, job['id'],
+                        job['site'], job['keyword'], job['first_page'], job['last_page'] or '', job['attempt'])
+            stop = threading.Event()
+
+            def keep_lease(job_id=job['id']):
+                while not stop.wait(queue.lease_seconds / 3):
+                    if not queue.heartbeat(job_id, worker_id):
+                        return
+
+            keeper = threading.Thread(target=keep_lease, name="lease-keeper", daemon=True)
+            keeper.start()
+            with self._data_lock:
+                before = len(self.data)
+            seen_mark = self.seen_index.mark() if self.seen_index is not None else None
             try:
-                response = requests.get(search_url, headers=self.headers, timeout=10)
-                print(f"Status kode untuk halaman {page}: {response.status_code}")
-                if response.status_code == 404:
-                    print(f"Halaman tidak ditemukan untuk URL: {search_url}")
-                    break
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-
-                class_names = ['search-result-item', 'news-article', 'post-item', 'article-item', 'news-post', 'post', 'article', 'list-item', 'news-item']
-                articles = None
-                for class_name in class_names:
-                    articles = soup.find_all('div', class_=class_name) or soup.find_all('article', class_=class_name)
-                    if articles:
-                        print(f"Ditemukan artikel dengan class: {class_name}")
-                        break
-
-                if not articles:
-                    print("Tidak ditemukan artikel. Mencoba mencari class lain...")
-                    divs_with_class = soup.find_all(['div', 'article'], class_=True)
-                    unique_classes = set(div['class'][0] for div in divs_with_class if div.get('class'))
-                    print(f"Class unik yang ditemukan: {unique_classes}")
-                    print("Tidak ada artikel lagi di AntaraNews.com atau halaman habis.")
-                    break
-
-                print(f"Halaman {page}: Ditemukan {len(articles)} artikel.")
-
-                for article in articles:
-                    try:
-                        title_tag = article.find('h3', class_=['post-title', 'title', 'article-title']) or \
-                                    article.find('h2', class_=['post-title', 'title', 'article-title']) or \
-                                    article.find('h4', class_=['post-title', 'title', 'article-title'])
-                        date_tag = article.find('span', class_=['post-date', 'date', 'article-date']) or \
-                                article.find('div', class_=['post-date', 'date', 'article-date']) or \
-                                article.find('time')
-                        link_tag = article.find('a', href=True)
-
-                        if not (title_tag and link_tag):
-                            print(f"Artikel tidak memiliki elemen lengkap (judul atau tautan). Missing: title={not title_tag}, link={not link_tag}, date={not date_tag}")
-                            continue
-
-                        title = title_tag.text.strip()
-                        summary_tag = article.find('p', class_='summary') or article.find('div', class_='excerpt')
-                        summary = summary_tag.text.strip() if summary_tag else ""
-                        if keyword_lower not in title.lower() and keyword_lower not in summary.lower():
-                            print(f"Judul atau ringkasan tidak mengandung keyword '{keyword}': {title}")
-                            continue
-
-                        link = link_tag['href']
-                        if not link.startswith('http'):
-                            link = f"https://www.antaranews.com{link}"
-
-                        article_date = None
-                        if date_tag:
-                            date_str = date_tag.text.strip()
-                            print(f"Raw date string: {date_str}")
-                            for date_format in ['%d %b %Y, %H:%M WIB', '%d/%m/%Y %H:%M', '%d %b %Y', '%Y-%m-%d %H:%M']:
-                                try:
-                                    article_date = datetime.strptime(date_str, date_format)
-                                    break
-                                except ValueError:
-                                    continue
-                            if article_date is None:
-                                print(f"Error parsing date: Tidak ada format yang cocok, Raw date: {date_str}")
-
-                        if article_date is None or (start_date <= article_date.date() <= end_date):
-                            self.data.append({
-                                'platform': 'AntaraNews.com',
-                                'date': start_date,
-                                'title': title,
-                                'url': link,
-                                'keyword': keyword
-                            })
-                            articles_found += 1
-                            print(f"Artikel ditemukan: {title}")
-
-                        if articles_found >= max_articles:
-                            break
-
-                    except Exception as e:
-                        print(f"Error parsing artikel AntaraNews.com: {e}")
-                        continue
-
-                page += 1
-                time.sleep(random.uniform(1, 3))
-
+                self.scrape_site(job['site'], job['keyword'], job['start_date'], job['end_date'],
+                                 job['max_articles'], job['first_page'], job['last_page'], strict=True)
+                self.drain_pipeline()
             except Exception as e:
-                print(f"Error saat scraping AntaraNews.com: {e}")
-                break
-
-        print(f"Selesai scraping AntaraNews.com: {articles_found} artikel ditemukan.")
-
-    def save_to_csv(self, filename_prefix="scraped_media"):
+                logger.error("Job %d gagal: %s", job['id'], e)
+                self.drain_pipeline()
+                # The retry must be able to collect these articles again
+                if seen_mark is not None:
+                    self.seen_index.rollback(seen_mark)
+                queue.fail(job['id'], worker_id, e)
+                continue
+            finally:
+                stop.set()
+                keeper.join()
+                with self._data_lock:
+                    records = self.data[before:]
+                    del self.data[before:]
+            if not queue.complete(job['id'], worker_id, records):
+                # The lease expired and the job went to another worker; these records were dropped
+                logger.warning("Lease job %d sudah diambil worker lain, hasil %d artikel dibuang.", job['id'], len(records))
+                if seen_mark is not None:
+                    self.seen_index.rollback(seen_mark)
+                continue
+            self.commit_progress()
+            done += 1
+
+    def cluster_duplicates(self, threshold=0.5):
+        """Beri setiap artikel cluster_id; artikel dengan judul hampir sama (lintas media) berbagi id."""
+        cluster_ids = TitleClusterer(threshold).cluster([record['title'] for record in self.data])
+        for record, cluster_id in zip(self.data, cluster_ids):
+            record['cluster_id'] = cluster_id
+        if 'cluster_id' not in self.fields:
+            self.fields = self.fields + CLUSTER_FIELDS
+        logger.info("%d artikel dikelompokkan menjadi %d cluster.", len(self.data), len(set(cluster_ids)))
+        return cluster_ids
+
+    def save_to_csv(self, filename_prefix="scraped_media", output_path=None):
         """Simpan data yang di-scrape ke file CSV."""
-        print(f"Jumlah artikel yang dikumpulkan: {len(self.data)}")
+        import pandas as pd  # heavy import, only needed for CSV output
+
+        logger.info("Jumlah artikel yang dikumpulkan: %d", len(self.data))
         if not self.data:
-            print("Tidak ada data untuk disimpan, membuat CSV dengan placeholder.")
-            df = pd.DataFrame([{
-                'platform': 'N/A',
-                'date': 'N/A',
-                'title': 'No articles found',
-                'url': 'N/A',
-                'keyword': 'N/A'
-            }])
+            logger.warning("Tidak ada data untuk disimpan, membuat CSV dengan placeholder.")
+            placeholder = dict.fromkeys(self.fields, 'N/A')
+            placeholder['title'] = 'No articles found'
+            df = pd.DataFrame([placeholder])
         else:
-            df = pd.DataFrame(self.data)
+            # Same ISO-8601 rendering as the streaming sink
+            df = pd.DataFrame([{field: _csv_value(record.get(field)) for field in self.fields}
+                               for record in self.data])
 
-        output_path = os.path.join(self.output_dir, f"{filename_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        output_path = output_path or self._output_path(filename_prefix, 'csv')
         df.to_csv(output_path, index=False, encoding='utf-8')
-        print(f"Data disimpan ke: {output_path}")
-
-def main():
-    keyword = input("Masukkan keyword (contoh: teknologi): ")
+        logger.info("Data disimpan ke: %s", output_path)
+        self.commit_progress()
+        return output_path
+
+    def save_to_jsonl(self, filename_prefix="scraped_media", output_path=None):
+        """Simpan data yang di-scrape ke file JSON Lines (satu artikel per baris)."""
+        logger.info("Jumlah artikel yang dikumpulkan: %d", len(self.data))
+        output_path = output_path or self._output_path(filename_prefix, 'jsonl')
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for record in self.data:
+                f.write(json.dumps(record, ensure_ascii=False, default=_json_default) + '\n')
+        logger.info("Data disimpan ke: %s", output_path)
+        self.commit_progress()
+        return output_path
+
+
+    def save_to_parquet(self, output_path=None, partition_cols=('platform', 'date')):
+        """Tambahkan data ke dataset Parquet yang dipartisi per platform dan tanggal (butuh pyarrow).
+
+        Kolom partisi hanya tersimpan di nama direktori (date=2025-05-14); baca
+        dataset dengan read_parquet() agar tipenya kembali sesuai arrow_schema().
+        """
+        import pyarrow.parquet as pq  # optional dependency, only needed for Parquet output
+
+        logger.info("Jumlah artikel yang dikumpulkan: %d", len(self.data))
+        if not self.data:
+            logger.warning("Tidak ada data untuk disimpan ke Parquet.")
+            return None
+        output_path = output_path or os.path.join(self.output_dir, "parquet")
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # Each run adds new files to the same dataset instead of rewriting it
+        pq.write_to_dataset(
+            records_to_arrow(self.data, include_body='content' in self.fields,
+                             include_cluster='cluster_id' in self.fields),
+            output_path,
+            partitioning=parquet_partitioning(partition_cols),
+            basename_template=f"part-{timestamp}-{os.getpid()}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore',
+        )
+        logger.info("Data disimpan ke dataset Parquet: %s", output_path)
+        self.commit_progress()
+        return output_path
+
+
+def arrow_schema(include_body=False, include_cluster=False):
+    """Skema kolom bertipe untuk output Arrow/Parquet."""
+    import pyarrow as pa
+
+    fields = [
+        ('platform', pa.dictionary(pa.int32(), pa.string())),
+        ('date', pa.date32()),
+        ('published_at', pa.timestamp('us', tz='Asia/Jakarta')),
+        ('fetched_at', pa.timestamp('us', tz='Asia/Jakarta')),
+        ('date_confidence', pa.dictionary(pa.int8(), pa.string())),
+        ('title', pa.string()),
+        ('url', pa.string()),
+        ('keyword', pa.dictionary(pa.int32(), pa.string())),
+    ]
+    if include_body:
+        fields += [('author', pa.string()), ('tags', pa.list_(pa.string())), ('content', pa.large_string())]
+    if include_cluster:
+        fields.append(('cluster_id', pa.int64()))
+    return pa.schema(fields)
+
+
+def parquet_partitioning(partition_cols=('platform', 'date'), dictionaries=None):
+    """Partisi hive bertipe untuk dataset Parquet, dengan tipe kolom dari arrow_schema()."""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    schema = arrow_schema()
+    fields = [schema.field(name) for name in partition_cols]
+    if not dictionaries:
+        # Writing a partitioning needs plain value types; dictionaries are only inferred on read
+        fields = [field.with_type(field.type.value_type) if pa.types.is_dictionary(field.type) else field
+                  for field in fields]
+    return ds.partitioning(pa.schema(fields), flavor='hive', dictionaries=dictionaries)
+
+
+def read_parquet(path, partition_cols=('platform', 'date')):
+    """Baca dataset dari save_to_parquet() sebagai pyarrow.Table; kolom partisi (mis. date) tetap bertipe."""
+    import pyarrow.dataset as ds
+
+    partitioning = parquet_partitioning(partition_cols, dictionaries='infer')
+    return ds.dataset(path, format='parquet', partitioning=partitioning).to_table()
+
+
+def records_to_arrow(records, include_body=False, include_cluster=False):
+    """Ubah daftar record artikel menjadi pyarrow.Table dengan skema arrow_schema()."""
+    import pyarrow as pa
+
+    schema = arrow_schema(include_body, include_cluster)
+    columns = {name: [record.get(name) for record in records] for name in schema.names}
+    return pa.Table.from_pydict(columns, schema=schema)
+
+
+# Exit codes for scripted/cron runs
+EXIT_OK = 0
+EXIT_NO_ARTICLES = 1
+EXIT_USAGE = 2
+EXIT_ERROR = 3
+EXIT_INTERRUPTED = 130
+
+
+def load_keywords(source):
+    """Baca daftar keyword dari "a, b, c" atau dari file "@path" (satu keyword per baris)."""
+    source = source.strip()
+    if source.startswith('@'):
+        with open(source[1:], encoding='utf-8') as f:
+            lines = [line.split('#', 1)[0].strip() for line in f]
+        return [line for line in lines if line]
+    return [keyword.strip() for keyword in source.split(',') if keyword.strip()]
+
+
+def _date_arg(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"format tanggal tidak valid: {value!r} (gunakan YYYY-MM-DD)")
+
+
+def _sites_arg(value):
+    sites = [site.strip() for site in value.split(',') if site.strip()]
+    unknown = [site for site in sites if site not in SITES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"situs tidak dikenal: {', '.join(unknown)} (pilihan: {', '.join(SITES)})")
+    return list(dict.fromkeys(sites))
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        description="Scraper berita online Indonesia. Tanpa argumen, program berjalan interaktif.",
+        epilog=f"Exit code: {EXIT_OK}=ada artikel, {EXIT_NO_ARTICLES}=tidak ada artikel, "
+               f"{EXIT_USAGE}=argumen salah, {EXIT_ERROR}=error, {EXIT_INTERRUPTED}=dihentikan.",
+    )
+    parser.add_argument('-k', '--keyword', action='append', default=[],
+                        help="keyword (boleh diulang atau dipisah koma)")
+    parser.add_argument('--keywords-file', help="file berisi satu keyword per baris")
+    parser.add_argument('-s', '--start-date', type=_date_arg, help="tanggal mulai (YYYY-MM-DD)")
+    parser.add_argument('-e', '--end-date', type=_date_arg, help="tanggal akhir (YYYY-MM-DD)")
+    parser.add_argument('-n', '--max-articles', type=int, default=50, help="maksimum artikel per situs per keyword")
+    parser.add_argument('--sites', type=_sites_arg, default=list(SITES),
+                        help=f"daftar situs dipisah koma (default: {','.join(SITES)})")
+    parser.add_argument('-w', '--workers', type=int, default=7, help="jumlah worker paralel")
+    parser.add_argument('--backend', choices=['requests', 'async'], default='requests', help="backend fetch HTTP")
+    parser.add_argument('--max-in-flight', type=int, default=100, help="batas request bersamaan (backend async)")
+    parser.add_argument('--parser', help=f"parser HTML BeautifulSoup (default: {DEFAULT_PARSER})")
+    parser.add_argument('--no-cache', action='store_true', help="matikan cache respons HTTP")
+    parser.add_argument('--cache-ttl', type=int, default=3600, help="umur cache respons dalam detik")
+    parser.add_argument('--offline', action='store_true', help="hanya pakai halaman dari cache")
+    parser.add_argument('-f', '--format', choices=['csv', 'jsonl', 'parquet'], default='csv',
+                        help="format output; parquet menambah ke dataset yang dipartisi per platform/tanggal")
+    parser.add_argument('-o', '--output', help="path file output, atau direktori dataset untuk parquet "
+                                               "(default: di --output-dir)")
+    parser.add_argument('--output-dir', default="scraped_media_data", help="direktori output dan cache")
+    parser.add_argument('--skip-seen', action='store_true',
+                        help="lewati URL yang sudah dikumpulkan di run sebelumnya dan berhenti di halaman yang sudah dikenal")
+    parser.add_argument('--since-last-run', action='store_true',
+                        help="berhenti paginasi saat mencapai artikel yang sudah dikumpulkan run sebelumnya")
+    parser.add_argument('--include-undated', action='store_true',
+                        help="sertakan artikel yang tanggalnya tidak bisa dibaca (date_confidence=missing)")
+    parser.add_argument('--browser-fallback', action='store_true',
+                        help="render halaman lewat Chrome headless jika HTML statis tidak berisi artikel (butuh selenium)")
+    parser.add_argument('--browser-pool-size', type=int, default=2, help="jumlah browser headless yang dipakai ulang")
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help="jumlah proses parser HTML (0 = parse di thread fetch)")
+    parser.add_argument('--fetch-bodies', action='store_true',
+                        help="ambil juga isi, penulis dan tag setiap artikel yang diterima")
+    parser.add_argument('--body-workers', type=int, default=8, help="jumlah worker pengambil isi artikel")
+    parser.add_argument('--cluster', action='store_true',
+                        help="kelompokkan berita yang sama lintas media (MinHash/LSH pada judul) dan tambah kolom cluster_id")
+    parser.add_argument('--cluster-threshold', type=float, default=0.5,
+                        help="kemiripan judul minimum untuk satu cluster (0-1, default 0.5)")
+    parser.add_argument('--stream', action='store_true',
+                        help="tulis setiap artikel langsung ke file output (aman dilanjutkan setelah crash)")
+    parser.add_argument('--flush-every', type=int, default=20, help="jumlah artikel per flush pada mode --stream")
+    queue_mode = parser.add_mutually_exclusive_group()
+    queue_mode.add_argument('--enqueue', dest='queue_mode', action='store_const', const='enqueue',
+                            help="masukkan job keyword x situs ke antrian --queue lalu keluar")
+    queue_mode.add_argument('--worker', dest='queue_mode', action='store_const', const='worker',
+                            help="kerjakan job dari antrian --queue sampai habis")
+    queue_mode.add_argument('--collect', dest='queue_mode', action='store_const', const='collect',
+                            help="kumpulkan hasil job dari antrian --queue ke file output")
+    parser.add_argument('--queue', help="file SQLite antrian job (bisa di storage bersama)")
+    parser.add_argument('--pages-per-job', type=int, help="pecah paginasi menjadi job per sekian halaman "
+                             "(--max-articles tetap berlaku per situs per keyword saat --collect)")
+    parser.add_argument('--max-pages', type=int, help="halaman terakhir yang dibagi dengan --pages-per-job")
+    parser.add_argument('--lease-seconds', type=int, default=600, help="lama lease job sebelum diambil ulang")
+    parser.add_argument('--max-attempts', type=int, default=3, help="jumlah percobaan per job sebelum gagal")
+    parser.add_argument('--worker-id', help="nama worker di antrian (default: host:pid)")
+    parser.add_argument('--poll-interval', type=float, default=5.0, help="jeda cek antrian saat kosong (detik)")
+    parser.add_argument('--metrics-file', help="tulis metrik format teks Prometheus ke file ini di akhir run")
+    parser.add_argument('--metrics-json', help="tulis ringkasan metrik per situs (JSON) ke file ini di akhir run")
+    parser.add_argument('-q', '--quiet', action='store_true', help="jangan cetak daftar judul di akhir")
+    parser.add_argument('-v', '--verbose', action='store_true', help="tampilkan log debug per artikel")
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], default='INFO',
+                        help="level log minimum (default: INFO)")
+    parser.add_argument('--log-format', choices=['text', 'json'], default='text', help="format log di stderr")
+    return parser
+
+
+def prompt_args(parser):
+    """Isi argumen lewat input() seperti mode interaktif lama; None jika input tidak valid."""
+    args = parser.parse_args([])
+    args.keyword = load_keywords(input("Masukkan keyword (contoh: teknologi; pisahkan dengan koma atau @file.txt): "))
     start_date = input("Masukkan tanggal mulai (YYYY-MM-DD): ")
     end_date = input("Masukkan tanggal akhir (YYYY-MM-DD): ")
-    max_articles = int(input("Masukkan jumlah maksimum artikel per situs (default 50): ") or 50)
+    args.max_articles = int(input("Masukkan jumlah maksimum artikel per situs (default 50): ") or 50)
+    args.workers = int(input("Masukkan jumlah worker paralel (default 7): ") or 7)
 
     try:
-        start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-        end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
-        if start_date > end_date:
-            print("Tanggal mulai harus sebelum tanggal akhir.")
-            return
+        args.start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+        args.end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
     except ValueError:
         print("Format tanggal tidak valid. Gunakan YYYY-MM-DD.")
-        return
-
-    scraper = OnlineMediaScraper()
-    scraper.scrape_detik(keyword, start_date, end_date, max_articles)
-    scraper.scrape_kompas(keyword, start_date, end_date, max_articles)
-    scraper.scrape_cnn(keyword, start_date, end_date, max_articles)
-    scraper.scrape_tempo(keyword, start_date, end_date, max_articles)
-    scraper.scrape_liputan6(keyword, start_date, end_date, max_articles)
-    scraper.scrape_viva(keyword, start_date, end_date, max_articles)
-    scraper.scrape_antara(keyword, start_date, end_date, max_articles)
-    scraper.save_to_csv(keyword.replace(' ', '_'))
-
-    if scraper.data:
+        return None
+    return args
+
+
+def collect_keywords(args):
+    keywords = []
+    for value in args.keyword:
+        keywords.extend(load_keywords(value))
+    if args.keywords_file:
+        keywords.extend(load_keywords(f"@{args.keywords_file}"))
+    return keywords
+
+
+def build_scraper(args):
+    return OnlineMediaScraper(
+        fetch_backend=args.backend,
+        max_in_flight=args.max_in_flight,
+        parser=args.parser,
+        use_cache=not args.no_cache,
+        cache_ttl=args.cache_ttl,
+        offline=args.offline,
+        output_dir=args.output_dir,
+        # Queue workers hand each job's records to the queue, so they must be kept
+        keep_in_memory=args.queue_mode == 'worker' or not (args.stream and args.quiet),
+        skip_seen=args.skip_seen,
+        since_last_run=args.since_last_run,
+        include_undated=args.include_undated,
+        fetch_bodies=args.fetch_bodies,
+        body_workers=args.body_workers,
+        parse_workers=args.parse_workers,
+        browser_fallback=args.browser_fallback,
+        browser_pool_size=args.browser_pool_size,
+    )
+
+
+def write_metrics(args, scraper):
+    if args.metrics_file:
+        scraper.metrics.write_prometheus(args.metrics_file)
+    if args.metrics_json:
+        scraper.metrics.write_json(args.metrics_json)
+
+
+def run_worker(args):
+    """Mode --worker: kerjakan job dari antrian sampai habis."""
+    queue = JobQueue(args.queue, args.lease_seconds, args.max_attempts)
+    scraper = build_scraper(args)
+    try:
+        done = scraper.run_queue_worker(queue, args.worker_id, args.poll_interval)
+    finally:
+        scraper.close()
+        write_metrics(args, scraper)
+        counts = queue.counts()
+        queue.close()
+    logger.info("Worker selesai: %d job dikerjakan; status antrian: %s", done, counts)
+    if counts.get('failed'):
+        logger.error("%d job gagal setelah %d percobaan.", counts['failed'], args.max_attempts)
+        return EXIT_ERROR
+    return EXIT_OK
+
+
+def run(args):
+    """Jalankan scraping sesuai argumen; kembalikan exit code."""
+    if args.queue_mode and not args.queue:
+        logger.error("Mode --%s membutuhkan --queue.", args.queue_mode)
+        return EXIT_USAGE
+    if args.queue_mode == 'worker':
+        return run_worker(args)
+
+    keywords = collect_keywords(args)
+    if args.queue_mode == 'collect':
+        if args.stream:
+            logger.error("Mode --stream tidak bisa dipakai dengan --collect.")
+            return EXIT_USAGE
+    else:
+        if not keywords:
+            logger.error("Keyword tidak boleh kosong.")
+            return EXIT_USAGE
+        if args.start_date is None or args.end_date is None:
+            logger.error("Tanggal mulai dan tanggal akhir wajib diisi.")
+            return EXIT_USAGE
+        if args.start_date > args.end_date:
+            logger.error("Tanggal mulai harus sebelum tanggal akhir.")
+            return EXIT_USAGE
+    if args.stream and args.format == 'parquet':
+        logger.error("Mode --stream hanya mendukung format csv atau jsonl.")
+        return EXIT_USAGE
+    if args.stream and args.cluster:
+        logger.error("Mode --cluster butuh semua artikel di memori dan tidak bisa dipakai dengan --stream.")
+        return EXIT_USAGE
+    if args.pages_per_job and not args.max_pages:
+        logger.error("--pages-per-job membutuhkan --max-pages.")
+        return EXIT_USAGE
+
+    if args.queue_mode == 'enqueue':
+        queue = JobQueue(args.queue, args.lease_seconds, args.max_attempts)
+        count = queue.enqueue_batch(dict.fromkeys(keywords), args.sites, args.start_date, args.end_date,
+                                    args.max_articles, args.pages_per_job, args.max_pages)
+        queue.close()
+        logger.info("%d job ditambahkan ke antrian %s.", count, args.queue)
+        return EXIT_OK
+
+    scraper = build_scraper(args)
+    if args.queue_mode == 'collect':
+        queue = JobQueue(args.queue)
+        scraper.data = [record for record in queue.results() if not keywords or record['keyword'] in keywords]
+        # Body and cluster columns come from what the workers stored, not from this run's flags
+        scraper.fields = RECORD_FIELDS + [field for field in BODY_FIELDS + CLUSTER_FIELDS
+                                          if any(field in record for record in scraper.data)]
+        logger.info("Status antrian: %s", queue.counts())
+        queue.close()
+        scraper.close()
+        keywords = keywords or list(dict.fromkeys(record['keyword'] for record in scraper.data))
+    prefix = keywords[0].replace(' ', '_') if len(keywords) == 1 else f"batch_{len(keywords)}_keywords"
+    if args.queue_mode != 'collect':
+        try:
+            if args.stream:
+                scraper.open_sink(args.output or scraper._output_path(prefix, args.format), args.format, args.flush_every)
+            keywords = scraper.scrape_batch(keywords, args.start_date, args.end_date, args.max_articles,
+                                            args.workers, args.sites)
+        finally:
+            scraper.close()
+            write_metrics(args, scraper)
+
+    if args.stream:
+        found = scraper.sink.count
+        logger.info("%d artikel baru ditulis ke: %s", found, scraper.sink.path)
+    else:
+        found = len(scraper.data)
+        if args.cluster:
+            scraper.cluster_duplicates(args.cluster_threshold)
+        if args.format == 'jsonl':
+            scraper.save_to_jsonl(prefix, args.output)
+        elif args.format == 'parquet':
+            scraper.save_to_parquet(args.output)
+        else:
+            scraper.save_to_csv(prefix, args.output)
+
+    if not found:
+        jobs = {(site_key, keyword) for keyword in keywords for site_key in args.sites}
+        # Nothing found because every job errored out is an outage, not an empty result
+        if args.queue_mode != 'collect' and jobs and jobs <= scraper.failed_jobs:
+            logger.error("Semua %d job keyword x situs gagal.", len(jobs))
+            return EXIT_ERROR
+        logger.warning("Tidak ada artikel yang ditemukan untuk keyword %s.", ', '.join(keywords))
+        return EXIT_NO_ARTICLES
+    if not args.quiet:
         print(f"\nJudul artikel yang ditemukan:")
         for i, article in enumerate(scraper.data, 1):
             print(f"{i}. {article['title']} ({article['platform']})")
-    else:
-        print(f"\nTidak ada artikel yang ditemukan untuk keyword '{keyword}'.")
+    return EXIT_OK
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = build_arg_parser()
+    configure_logging()
+    try:
+        if argv:
+            args = parser.parse_args(argv)
+        else:
+            args = prompt_args(parser)
+            if args is None:
+                return EXIT_USAGE
+        configure_logging('DEBUG' if args.verbose else args.log_level, args.log_format)
+        return run(args)
+    except KeyboardInterrupt:
+        logger.warning("Dihentikan oleh pengguna.")
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        logger.error("Error: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+        return EXIT_ERROR
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
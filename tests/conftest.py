@@ -0,0 +1,27 @@
+import os
+import sys
+import urllib.parse
+
+import pytest
+
+# main.py lives at the repository root and is not an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+DETIK_ITEM = ('<article><h3 class="media__title"><a href="https://news.detik.com/berita/{0}">Banjir {0}</a></h3>'
+              '<span class="media__date"><span title="{1}">{1}</span></span></article>')
+
+
+@pytest.fixture
+def detik_pages(monkeypatch):
+    # Fake Detik search results: tests fill {page: [(slug, date text), ...]}; other pages are empty
+    pages = {}
+
+    def fetch(self, url, timeout=10, site_key=None):
+        page = int(urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)['page'][0])
+        items = ''.join(DETIK_ITEM.format(slug, date_str) for slug, date_str in pages.get(page, []))
+        return main.FetchResult(url, 200, f'<html><body>{items}</body></html>')
+
+    monkeypatch.setattr(main.OnlineMediaScraper, 'fetch', fetch)
+    return pages
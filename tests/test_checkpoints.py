@@ -0,0 +1,79 @@
+from datetime import date, datetime, timedelta, timezone
+
+import main
+
+WITA = timezone(timedelta(hours=8))
+
+
+def test_get_update_and_reload(tmp_path):
+    path = str(tmp_path / 'checkpoints.json')
+    store = main.CheckpointStore(path)
+    assert store.get('detik', 'banjir') == (None, set())
+
+    newest = datetime(2025, 5, 14, 9, 0, tzinfo=main.WIB)
+    store.update('detik', 'Banjir ', ['https://a/1', 'https://a/2'], newest)
+    store.save()
+    assert main.CheckpointStore(path).get('detik', 'banjir') == (newest, {'https://a/1', 'https://a/2'})
+
+
+def test_newest_date_is_compared_as_datetime(tmp_path):
+    store = main.CheckpointStore(str(tmp_path / 'checkpoints.json'))
+    # 09:30 WIB is later than 10:00 WITA (09:00 WIB), although "...T09:30+07:00" < "...T10:00+08:00" as text
+    later = datetime(2025, 5, 14, 9, 30, tzinfo=main.WIB)
+    store.update('detik', 'banjir', [], later)
+    store.update('detik', 'banjir', [], datetime(2025, 5, 14, 10, 0, tzinfo=WITA))
+    assert store.get('detik', 'banjir')[0] == later
+
+
+def test_save_merges_with_other_processes(tmp_path):
+    path = str(tmp_path / 'checkpoints.json')
+    first, second = main.CheckpointStore(path), main.CheckpointStore(path)
+    first.update('detik', 'banjir', ['https://a/1'], datetime(2025, 5, 14, tzinfo=main.WIB))
+    second.update('detik', 'banjir', ['https://a/2'], datetime(2025, 5, 13, tzinfo=main.WIB))
+    second.update('kompas', 'banjir', ['https://b/1'], None)
+    first.save()
+    second.save()
+
+    store = main.CheckpointStore(path)
+    assert store.get('detik', 'banjir') == (datetime(2025, 5, 14, tzinfo=main.WIB), {'https://a/1', 'https://a/2'})
+    assert store.get('kompas', 'banjir') == (None, {'https://b/1'})
+
+
+def test_recent_urls_are_bounded(tmp_path):
+    store = main.CheckpointStore(str(tmp_path / 'checkpoints.json'))
+    store.update('detik', 'banjir', [f'https://a/{i}' for i in range(main.CheckpointStore.MAX_RECENT_URLS + 10)], None)
+    assert len(store.get('detik', 'banjir')[1]) == main.CheckpointStore.MAX_RECENT_URLS
+
+
+def scrape(tmp_path, max_articles=50, start=date(2025, 1, 1), end=date(2025, 12, 31)):
+    scraper = main.OnlineMediaScraper(use_cache=False, output_dir=str(tmp_path), since_last_run=True)
+    scraper.scrape_detik('banjir', start, end, max_articles)
+    scraper.close()
+    scraper.commit_progress()
+    return [record['url'].rsplit('/', 1)[1] for record in scraper.data]
+
+
+def test_since_last_run_collects_only_newer_articles(tmp_path, detik_pages):
+    detik_pages[1] = [('d-2', "14 Mei 2025 09:00 WIB"), ('d-1', "13 Mei 2025 09:00 WIB")]
+    assert scrape(tmp_path) == ['d-2', 'd-1']
+
+    detik_pages[1] = [('d-3', "15 Mei 2025 09:00 WIB")] + detik_pages[1]
+    assert scrape(tmp_path) == ['d-3']
+    assert scrape(tmp_path) == []
+
+
+def test_checkpoint_does_not_move_when_the_run_stops_early(tmp_path, detik_pages):
+    detik_pages[1] = [(f'd-{i}', f"{20 - i} Mei 2025 09:00 WIB") for i in range(4)]
+    detik_pages[2] = [(f'd-{i}', f"{20 - i} Mei 2025 09:00 WIB") for i in range(4, 6)]
+    # Capped by max_articles before reaching the end of the results
+    assert scrape(tmp_path, max_articles=3) == ['d-0', 'd-1', 'd-2']
+    assert main.CheckpointStore(str(tmp_path / 'checkpoints.json')).get('detik', 'banjir') == (None, set())
+    assert scrape(tmp_path) == [f'd-{i}' for i in range(6)]
+    assert scrape(tmp_path) == []
+
+
+def test_older_window_ignores_the_checkpoint(tmp_path, detik_pages):
+    detik_pages[1] = [('d-2', "14 Mei 2025 09:00 WIB"), ('d-1', "14 Mar 2025 09:00 WIB")]
+    scrape(tmp_path)
+    # A backfill over a range that ends before the checkpoint
+    assert scrape(tmp_path, start=date(2025, 3, 1), end=date(2025, 3, 31)) == ['d-1']
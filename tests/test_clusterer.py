@@ -0,0 +1,51 @@
+import pytest
+
+import main
+
+
+@pytest.fixture
+def clusterer():
+    return main.TitleClusterer(threshold=0.5)
+
+
+def test_near_duplicates_share_a_cluster(clusterer):
+    titles = [
+        "Banjir Rendam Ribuan Rumah di Jakarta Timur",
+        "Gempa Magnitudo 5,2 Guncang Sulawesi Tengah",
+        "Banjir rendam ribuan rumah di Jakarta Timur!",
+        "BANJIR RENDAM RIBUAN RUMAH DI JAKARTA TIMUR, WARGA MENGUNGSI",
+        "Harga Beras Naik Menjelang Lebaran",
+    ]
+    assert clusterer.cluster(titles) == [1, 2, 1, 1, 3]
+
+
+def test_unrelated_titles_get_their_own_clusters(clusterer):
+    titles = ["Timnas Indonesia Menang 2-0", "Rupiah Melemah Terhadap Dolar", "Jadwal KRL Berubah Mulai Senin"]
+    assert clusterer.cluster(titles) == [1, 2, 3]
+
+
+def test_empty_and_short_titles(clusterer):
+    assert clusterer.cluster([]) == []
+    assert clusterer.cluster(["", "", "ok"]) == [1, 1, 2]
+
+
+def test_shingles_ignore_case_and_punctuation(clusterer):
+    assert clusterer.shingles("Banjir, Jakarta!") == clusterer.shingles("banjir jakarta")
+    assert clusterer.shingles("abc") == {"abc"}
+
+
+def test_similarity_estimates_jaccard(clusterer):
+    signature = clusterer.signature("Banjir Rendam Ribuan Rumah di Jakarta Timur")
+    assert clusterer.similarity(signature, signature) == 1.0
+    other = clusterer.signature("Harga Beras Naik Menjelang Lebaran")
+    assert clusterer.similarity(signature, other) < 0.2
+
+
+def test_signatures_are_deterministic_for_a_seed():
+    title = "Banjir Rendam Ribuan Rumah di Jakarta Timur"
+    assert main.TitleClusterer(seed=7).signature(title) == main.TitleClusterer(seed=7).signature(title)
+
+
+def test_num_perm_must_be_a_multiple_of_bands():
+    with pytest.raises(ValueError):
+        main.TitleClusterer(num_perm=50, bands=16)
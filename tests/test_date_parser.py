@@ -0,0 +1,99 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+import main
+
+NOW = datetime(2025, 5, 14, 12, 0, tzinfo=main.WIB)
+
+
+@pytest.fixture
+def parser():
+    return main.IndonesianDateParser()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("3 Jan 2024", date(2024, 1, 3)),
+    ("3 Peb 2024", date(2024, 2, 3)),
+    ("14 Mei 2025", date(2025, 5, 14)),
+    ("3 Agu 2024", date(2024, 8, 3)),
+    ("3 Agt 2024", date(2024, 8, 3)),
+    ("3 Ags 2024", date(2024, 8, 3)),
+    ("10 Okt. 2024", date(2024, 10, 10)),
+    ("1 Nop 2024", date(2024, 11, 1)),
+    ("25 Desember 2023", date(2023, 12, 25)),
+    ("7 August 2024", date(2024, 8, 7)),
+])
+def test_month_names_and_abbreviations(parser, text, expected):
+    result, confidence = parser.parse_detailed(text)
+    assert result.date() == expected
+    assert confidence == 'day'
+
+
+def test_unknown_month_name_is_not_parsed(parser):
+    assert parser.parse_detailed("14 Foo 2025") == (None, 'missing')
+
+
+def test_time_without_zone_defaults_to_wib(parser):
+    result, confidence = parser.parse_detailed("Rabu, 14 Mei 2025, 09:00")
+    assert result == datetime(2025, 5, 14, 9, 0, tzinfo=main.WIB)
+    assert confidence == 'exact'
+
+
+@pytest.mark.parametrize('text, hours', [
+    ("14 Mei 2025 | 09:00 WIB", 7),
+    ("14 Mei 2025 | 09:00 WITA", 8),
+    ("14 Mei 2025 | 09:00 WIT", 9),
+    ("14/05/2025 09.00 wita", 8),
+    ("2025-05-14 09:00 WIT", 9),
+])
+def test_zones(parser, text, hours):
+    result = parser.parse(text)
+    assert result.utcoffset() == timedelta(hours=hours)
+    assert (result.hour, result.minute) == (9, 0)
+
+
+def test_wita_and_wib_are_the_same_instant_an_hour_apart(parser):
+    wib = parser.parse("14 Mei 2025 09:00 WIB")
+    wita = parser.parse("14 Mei 2025 10:00 WITA")
+    assert wib == wita
+    assert wita.astimezone(timezone.utc) == datetime(2025, 5, 14, 2, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize('text, delta', [
+    ("30 detik yang lalu", timedelta(seconds=30)),
+    ("5 menit lalu", timedelta(minutes=5)),
+    ("2 jam yang lalu", timedelta(hours=2)),
+    ("3 Hari Yang Lalu", timedelta(days=3)),
+    ("1 minggu yang lalu", timedelta(weeks=1)),
+    ("kemarin", timedelta(days=1)),
+])
+def test_relative_times(parser, text, delta):
+    assert parser.parse_detailed(text, now=NOW) == (NOW - delta, 'relative')
+
+
+def test_missing_and_unparseable(parser):
+    assert parser.parse_detailed(None) == (None, 'missing')
+    assert parser.parse_detailed("") == (None, 'missing')
+    assert parser.parse_detailed("baru saja") == (None, 'missing')
+    assert parser.parse("31/02/2025") is None
+
+
+def test_preferred_pattern_is_remembered_per_site(parser):
+    # Matches both the numeric (15/05) and the ISO (2025-05-14) pattern; numeric is tried first by default
+    ambiguous = "2025-05-14 diperbarui 15/05/2025"
+    assert parser.parse(ambiguous).day == 15
+
+    parser.parse("2025-05-20T08:00", site_key='kompas')
+    assert parser.parse(ambiguous, site_key='kompas').day == 14
+    # Other sites keep the default order
+    assert parser.parse(ambiguous, site_key='detik').day == 15
+
+
+def test_preferred_pattern_falls_back_to_the_others(parser):
+    parser.parse("2025-05-20", site_key='kompas')
+    result, confidence = parser.parse_detailed("14 Mei 2025 09:00", site_key='kompas')
+    assert result == datetime(2025, 5, 14, 9, 0, tzinfo=main.WIB)
+    assert confidence == 'exact'
+    # The pattern that matched becomes the new preference
+    assert parser.parse("2025-05-14 diperbarui 15 Mei 2025", site_key='kompas').day == 15
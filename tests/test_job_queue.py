@@ -0,0 +1,154 @@
+import urllib.parse
+from datetime import date, datetime
+
+import pytest
+
+import main
+
+START, END = date(2025, 1, 1), date(2025, 1, 31)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(main.time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = main.JobQueue(str(tmp_path / 'jobs.sqlite'), lease_seconds=60, max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def test_enqueue_batch_splits_page_ranges(queue):
+    assert queue.enqueue_batch(['banjir'], ['detik', 'kompas'], START, END, pages_per_job=2, max_pages=5) == 6
+    job = queue.lease('w1')
+    assert (job['keyword'], job['site'], job['first_page'], job['last_page']) == ('banjir', 'detik', 1, 2)
+    assert (job['start_date'], job['end_date'], job['attempt']) == (START, END, 1)
+    assert [queue.lease('w1')['last_page'] for _ in range(2)] == [4, 5]
+
+
+def test_lease_hands_each_job_to_one_worker(queue):
+    queue.enqueue('banjir', 'detik', START, END)
+    queue.enqueue('banjir', 'kompas', START, END)
+    first, second = queue.lease('w1'), queue.lease('w2')
+    assert {first['site'], second['site']} == {'detik', 'kompas'}
+    assert queue.lease('w3') is None
+    assert queue.counts() == {'leased': 2}
+
+
+def test_complete_stores_results(queue):
+    job_id = queue.enqueue('banjir', 'detik', START, END)
+    queue.lease('w1')
+    published = datetime(2025, 1, 5, 9, 0, tzinfo=main.WIB)
+    records = [
+        {'keyword': 'banjir', 'url': 'https://a/1', 'date': date(2025, 1, 5), 'published_at': published},
+        {'keyword': 'banjir', 'url': 'https://a/1', 'date': date(2025, 1, 5), 'published_at': published},
+    ]
+    assert queue.complete(job_id, 'w1', records)
+    assert queue.counts() == {'done': 1}
+    assert queue.results() == [records[0]]
+
+
+def test_failed_job_is_retried_until_max_attempts(queue):
+    job_id = queue.enqueue('banjir', 'detik', START, END)
+    assert queue.lease('w1')['attempt'] == 1
+    queue.fail(job_id, 'w1', "timeout")
+    assert queue.counts() == {'pending': 1}
+
+    assert queue.lease('w2')['attempt'] == 2
+    queue.fail(job_id, 'w2', "timeout")
+    assert queue.counts() == {'failed': 1}
+    assert queue.lease('w3') is None
+
+
+def test_expired_lease_is_taken_over(queue, clock):
+    job_id = queue.enqueue('banjir', 'detik', START, END)
+    queue.lease('w1')
+    clock[0] += 30
+    assert queue.heartbeat(job_id, 'w1')
+    # The heartbeat pushed the expiry to 30 + 60 seconds after the lease
+    clock[0] += 59
+    assert queue.lease('w2') is None
+
+    clock[0] += 2
+    job = queue.lease('w2')
+    assert (job['id'], job['attempt']) == (job_id, 2)
+    # The old worker lost the lease: its heartbeat and results are ignored
+    assert not queue.heartbeat(job_id, 'w1')
+    assert not queue.complete(job_id, 'w1', [{'keyword': 'banjir', 'url': 'https://a/1'}])
+    assert queue.complete(job_id, 'w2', [])
+    assert queue.results() == []
+
+
+def test_expired_lease_after_max_attempts_is_marked_failed(queue, clock):
+    queue.enqueue('banjir', 'detik', START, END)
+    queue.lease('w1')
+    clock[0] += 61
+    queue.lease('w2')
+    clock[0] += 61
+    assert queue.lease('w3') is None
+    assert queue.counts() == {'failed': 1}
+
+
+def test_results_cap_page_range_jobs_at_max_articles(queue):
+    queue.enqueue_batch(['banjir'], ['detik'], START, END, max_articles=3, pages_per_job=1, max_pages=2)
+    for page in (1, 2):
+        job = queue.lease('w1')
+        records = [{'keyword': 'banjir', 'url': f'https://a/{page}{i}'} for i in range(2)]
+        assert queue.complete(job['id'], 'w1', records)
+    assert [record['url'] for record in queue.results()] == ['https://a/10', 'https://a/11', 'https://a/20']
+
+
+ITEM = ('<div class="article__item"><h3 class="article__title">Banjir {0}</h3>'
+        '<div class="article__date">Rabu, 14/05/2025 09:00</div>'
+        '<a class="article__link" href="https://www.kompas.com/read/{0}">x</a></div>')
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    # Two pages of Kompas results; pages listed in scraper.failures fail once
+    failures = []
+
+    def fetch(self, url, timeout=10, site_key=None):
+        page = int(urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)['page'][0])
+        if page in failures:
+            failures.remove(page)
+            raise main.requests.ConnectionError("koneksi terputus")
+        items = ''.join(ITEM.format(f'{page}{i}') for i in range(2)) if page <= 2 else ''
+        return main.FetchResult(url, 200, f'<html><body>{items}</body></html>')
+
+    monkeypatch.setattr(main.OnlineMediaScraper, 'fetch', fetch)
+    scraper = main.OnlineMediaScraper(use_cache=False, output_dir=str(tmp_path / 'out'), skip_seen=True)
+    scraper.failures = failures
+    yield scraper
+    scraper.close()
+
+
+def test_worker_retry_collects_the_failed_job_again(tmp_path, scraper):
+    queue = main.JobQueue(str(tmp_path / 'worker.sqlite'))
+    queue.enqueue('banjir', 'kompas', START, date(2025, 12, 31))
+    scraper.failures.append(2)
+    assert scraper.run_queue_worker(queue, 'w1', poll_interval=0) == 1
+    assert queue.counts() == {'done': 1}
+    assert sorted(record['url'] for record in queue.results()) == [
+        f'https://www.kompas.com/read/{page}{i}' for page in (1, 2) for i in range(2)]
+    queue.close()
+
+
+def test_worker_drops_seen_urls_when_lease_is_lost(tmp_path, scraper, monkeypatch):
+    queue = main.JobQueue(str(tmp_path / 'worker.sqlite'))
+    queue.enqueue('banjir', 'kompas', START, date(2025, 12, 31))
+
+    def complete_elsewhere(job_id, worker_id, records):
+        # Another worker took over the expired lease and finished the job first
+        queue._conn.execute("UPDATE jobs SET status = 'done', lease_owner = 'w2' WHERE id = ?", (job_id,))
+        return False
+
+    monkeypatch.setattr(queue, 'complete', complete_elsewhere)
+    assert scraper.run_queue_worker(queue, 'w1', poll_interval=0) == 0
+    assert len(scraper.seen_index) == 0
+    assert not scraper.seen_index.contains('https://www.kompas.com/read/10')
+    queue.close()
@@ -0,0 +1,86 @@
+import csv
+import json
+from datetime import date, datetime
+
+import pytest
+
+import main
+
+
+def record(url, **fields):
+    return dict({'keyword': 'banjir', 'url': url, 'title': f"Judul {url}", 'platform': 'Detik.com'}, **fields)
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_csv_writes_header_once_and_skips_duplicates(tmp_path):
+    path = str(tmp_path / 'out.csv')
+    sink = main.RecordSink(path)
+    assert sink.write(record('https://a/1'))
+    assert not sink.write(record('https://a/1'))
+    sink.close()
+
+    sink = main.RecordSink(path)
+    assert not sink.write(record('https://a/1'))
+    assert sink.write(record('https://a/2'))
+    sink.close()
+    rows = read_csv(path)
+    assert [row['url'] for row in rows] == ['https://a/1', 'https://a/2']
+    assert list(rows[0]) == main.RECORD_FIELDS
+
+
+def test_csv_resume_drops_torn_multiline_record(tmp_path):
+    path = tmp_path / 'out.csv'
+    sink = main.RecordSink(str(path))
+    sink.write(record('https://a/1', title='Banjir\n"Jakarta"'))
+    sink.close()
+    # A crash in the middle of a record whose quoted title spans lines
+    with open(path, 'ab') as f:
+        f.write(b'Detik.com,,,,,"Banjir\nBekasi\n')
+
+    sink = main.RecordSink(str(path))
+    assert sink.write(record('https://a/2'))
+    sink.close()
+    rows = read_csv(path)
+    assert [row['url'] for row in rows] == ['https://a/1', 'https://a/2']
+    assert rows[0]['title'] == 'Banjir\n"Jakarta"'
+
+
+def test_csv_resume_refuses_a_different_header(tmp_path):
+    path = str(tmp_path / 'out.csv')
+    main.RecordSink(path).close()
+    with pytest.raises(ValueError):
+        main.RecordSink(path, fields=main.RECORD_FIELDS + main.BODY_FIELDS)
+
+
+def test_jsonl_resume_drops_torn_line(tmp_path):
+    path = tmp_path / 'out.jsonl'
+    sink = main.RecordSink(str(path))
+    sink.write(record('https://a/1'))
+    sink.close()
+    with open(path, 'ab') as f:
+        f.write(b'{"keyword": "banjir", "url": "https://a/')
+
+    sink = main.RecordSink(str(path))
+    assert not sink.write(record('https://a/1'))
+    assert sink.write(record('https://a/2'))
+    sink.close()
+    with open(path, encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f]
+    assert [line['url'] for line in lines] == ['https://a/1', 'https://a/2']
+
+
+def test_dates_are_written_in_iso_format(tmp_path):
+    published = datetime(2025, 5, 14, 9, 0, tzinfo=main.WIB)
+    for name in ('out.csv', 'out.jsonl'):
+        sink = main.RecordSink(str(tmp_path / name))
+        sink.write(record('https://a/1', date=date(2025, 5, 14), published_at=published))
+        sink.close()
+    with open(tmp_path / 'out.jsonl', encoding='utf-8') as f:
+        line = json.loads(f.readline())
+    row = read_csv(tmp_path / 'out.csv')[0]
+    assert (line['date'], line['published_at']) == (row['date'], row['published_at'])
+    assert line['published_at'] == '2025-05-14T09:00:00+07:00'
@@ -0,0 +1,13 @@
+from datetime import date
+
+import main
+
+
+def test_date_column_is_the_wib_calendar_day(tmp_path, detik_pages):
+    # 00:30 WITA on 14 May is 23:30 WIB on 13 May
+    detik_pages[1] = [('d-1', "14 Mei 2025 00:30 WITA"), ('d-2', "14 Mei 2025 09:00 WIB")]
+    scraper = main.OnlineMediaScraper(use_cache=False, output_dir=str(tmp_path))
+    assert scraper.scrape_detik('banjir', date(2025, 5, 13), date(2025, 5, 13), 10) == 1
+    scraper.close()
+    assert [(record['url'], record['date']) for record in scraper.data] == [
+        ('https://news.detik.com/berita/d-1', date(2025, 5, 13))]
@@ -0,0 +1,67 @@
+import main
+
+
+def test_add_and_contains(tmp_path):
+    index = main.SeenUrlIndex(str(tmp_path / 'seen.idx'))
+    assert index.add("https://news.detik.com/berita/d-1/banjir")
+    assert not index.add("https://news.detik.com/berita/d-1/banjir")
+    assert index.contains("https://news.detik.com/berita/d-1/banjir")
+    assert not index.contains("https://news.detik.com/berita/d-2/gempa")
+    assert len(index) == 1
+
+
+def test_urls_are_normalized(tmp_path):
+    index = main.SeenUrlIndex(str(tmp_path / 'seen.idx'))
+    index.add("HTTPS://www.Kompas.com:443/read/banjir?page=2&id=7#komentar")
+    assert index.contains("https://www.kompas.com/read/banjir?id=7&page=2")
+
+
+def test_only_flushed_urls_persist(tmp_path):
+    path = str(tmp_path / 'seen.idx')
+    index = main.SeenUrlIndex(path)
+    index.add("https://a/1")
+    index.flush()
+    index.add("https://a/2")
+
+    reopened = main.SeenUrlIndex(path)
+    assert reopened.contains("https://a/1")
+    assert not reopened.contains("https://a/2")
+    assert len(reopened) == 1
+
+
+def test_torn_trailing_entry_is_ignored(tmp_path):
+    path = tmp_path / 'seen.idx'
+    index = main.SeenUrlIndex(str(path))
+    index.add("https://a/1")
+    index.flush()
+    with open(path, 'ab') as f:
+        f.write(b'\x01\x02\x03')
+
+    reopened = main.SeenUrlIndex(str(path))
+    assert reopened.contains("https://a/1")
+    assert len(reopened) == 1
+
+
+def test_rollback_forgets_urls_added_since_mark(tmp_path):
+    path = str(tmp_path / 'seen.idx')
+    index = main.SeenUrlIndex(path)
+    index.add("https://a/1")
+    mark = index.mark()
+    index.add("https://a/2")
+    index.add("https://a/3")
+    index.rollback(mark)
+
+    assert index.contains("https://a/1")
+    assert not index.contains("https://a/2")
+    assert index.add("https://a/3")
+    index.flush()
+    assert len(main.SeenUrlIndex(path)) == 2
+
+
+def test_rollback_keeps_flushed_urls(tmp_path):
+    index = main.SeenUrlIndex(str(tmp_path / 'seen.idx'))
+    index.add("https://a/1")
+    index.flush()
+    mark = index.mark()
+    index.rollback(mark)
+    assert index.contains("https://a/1")